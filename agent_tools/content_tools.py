@@ -1,24 +1,30 @@
+import asyncio
 from typing import Literal, Optional
 from datetime import datetime, timezone
 from pydantic import BaseModel
 from agents import Runner, RunContextWrapper, function_tool
 from ai_agents.content_creator_agent import create_content_creator_agent
+from agent_tools.conversation_tools import get_conversation_summary
 
 from utils.agent_utils import AgentContext
 from utils.shared_types import ToolResponse
+from utils.profiling_utils import profiled
+from utils.tweet_text_utils import MAX_TWEET_LENGTH, validate_tweet
 
 
 class ContentCreatorInput(BaseModel):
     topic: str
     platform: Literal["twitter", "instagram", "email"]
-    content_type: Literal["tweet", "reply", "dm", "email", "story", "post"]
+    content_type: Literal["tweet", "thread", "reply", "dm", "email", "story", "post"]
     content_max_length: Optional[int] = None
     tone: Optional[str] = None
     context: Optional[str] = None
+    conversation_id: Optional[str] = None
     require_variations: Optional[bool] = False
 
 
 @function_tool
+@profiled
 async def create_social_content(context: RunContextWrapper[AgentContext], input: ContentCreatorInput) -> ToolResponse:
     """
     Generate branded social media content using the content creator agent.
@@ -27,10 +33,11 @@ async def create_social_content(context: RunContextWrapper[AgentContext], input:
         input (ContentCreatorInput): The content creation request containing:
             - topic (str): The main subject or theme for the content.
             - platform (Literal["twitter", "instagram", "email"]): Target platform for the content.
-            - content_type (Literal["tweet", "reply", "dm", "email", "story", "post"]): Type of content to generate.
+            - content_type (Literal["tweet", "thread", "reply", "dm", "email", "story", "post"]): Type of content to generate.
             - content_max_length (Optional[int]): Maximum character limit for the content.
             - tone (Optional[str]): Desired tone or style (e.g., "professional", "casual", "friendly").
             - context (Optional[str]): Additional context or background information (e.g. conversation snippet, related news article, etc.).
+            - conversation_id (Optional[str]): Conversation to reply in. Its thread summary is added to the context automatically.
             - require_variations (Optional[bool]): Whether to include alternative versions (default: False).
 
     Returns:
@@ -39,6 +46,8 @@ async def create_social_content(context: RunContextWrapper[AgentContext], input:
             - platform (str): The target platform for the content.
             - content_type (str): The type of content generated.
             - alternative_versions (Optional[List[str]]): Alternative content versions if requested.
+            - weighted_length (Optional[int]): Twitter weighted length of `content` (single tweets only).
+            - length_valid (Optional[bool]): Whether `content` fits the length limit (single tweets only).
             - created_at (str): ISO 8601 UTC timestamp of content creation.
     """
     try:
@@ -48,16 +57,26 @@ async def create_social_content(context: RunContextWrapper[AgentContext], input:
         mission = (
             f"Generate a {input.content_type} for {input.platform} about {input.topic}."
         )
-        if input.content_max_length:
-            mission += (
-                f" Content must be {input.content_max_length} characters or less."
-            )
+        # Threads are split into tweets when posted, so only single tweets are capped
+        is_single_tweet = input.platform == "twitter" and input.content_type != "thread"
+        max_length = input.content_max_length
+        if is_single_tweet:
+            max_length = min(max_length or MAX_TWEET_LENGTH, MAX_TWEET_LENGTH)
+        if max_length:
+            mission += f" Content must be {max_length} characters or less."
         if input.tone:
             mission += f" Use a {input.tone} tone."
-        if input.context:
-            mission += f" Context: {input.context}"
         if input.require_variations:
             mission += " Include 2-3 alternative versions."
+        # Free-form context goes last, after the short templated parts
+        context_parts = [input.context] if input.context else []
+        if input.conversation_id:
+            thread_summary = await asyncio.to_thread(
+                get_conversation_summary, input.conversation_id
+            )
+            context_parts.append(f"Conversation thread:\n{thread_summary}")
+        if context_parts:
+            mission += f" Context: {' '.join(context_parts)}"
 
         character_file = context.context.character_file
 
@@ -68,6 +87,27 @@ async def create_social_content(context: RunContextWrapper[AgentContext], input:
             context=AgentContext(character_file=character_file),
         )
 
+        context.context.record_usage(agent.name, result.context_wrapper.usage)
+
+        validation = None
+        if is_single_tweet:
+            # Check the weighted length locally and retry once with the exact error,
+            # rather than letting post_tweet fail after a round trip to Twitter
+            validation = validate_tweet(
+                result.final_output.primary_content, max_length=max_length
+            )
+            if not validation.valid:
+                result = await Runner.run(
+                    agent,
+                    f"{mission} Your previous attempt was rejected: "
+                    f"{'; '.join(validation.errors)}. Shorten it.",
+                    context=AgentContext(character_file=character_file),
+                )
+                context.context.record_usage(agent.name, result.context_wrapper.usage)
+                validation = validate_tweet(
+                    result.final_output.primary_content, max_length=max_length
+                )
+
         return ToolResponse(
             success=True,
             data={
@@ -75,8 +115,10 @@ async def create_social_content(context: RunContextWrapper[AgentContext], input:
                 "platform": result.final_output.platform,
                 "content_type": result.final_output.content_type,
                 "alternative_versions": result.final_output.alternative_versions,
+                "weighted_length": validation.weighted_length if validation else None,
+                "length_valid": validation.valid if validation else None,
                 "created_at": datetime.now(timezone.utc).isoformat(),
             },
         )
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
@@ -0,0 +1,199 @@
+import tweepy
+from agents import function_tool
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+
+from agent_tools.twitter_tools import TwitterAPI, _get_twitter_api
+from utils.shared_types import ToolResponse
+from utils.profiling_utils import profiled
+
+
+# Recent search only covers the last 7 days; cap pages so a viral thread can't
+# stall a run (100 tweets per page)
+CONVERSATION_MAX_PAGES = 5
+SUMMARY_MAX_CHARS = 2000
+SUMMARY_TWEET_MAX_CHARS = 200
+
+
+@dataclass
+class ConversationThread:
+    """In-memory reply tree of a single conversation"""
+
+    conversation_id: str
+    tweets: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    parents: Dict[str, str] = field(default_factory=dict)
+    # Newest ID returned by a conversation search. Kept apart from the root tweet,
+    # which may be older than the 7 days recent search accepts as `since_id`.
+    search_newest_id: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    def add(self, tweet: Dict[str, Any]) -> bool:
+        """Add a formatted tweet to the thread. Returns False if it was already known."""
+        tweet_id = str(tweet["id"])
+        is_new = tweet_id not in self.tweets
+        self.tweets[tweet_id] = tweet
+
+        for ref in tweet.get("referenced_tweets", []):
+            if ref["type"] == "replied_to":
+                self.parents[tweet_id] = str(ref["id"])
+        return is_new
+
+    def children(self) -> Dict[str, List[str]]:
+        """Map each tweet ID to its replies, oldest first.
+
+        Replies whose parent is not in the thread (e.g. outside the search window)
+        are attached to the root tweet.
+        """
+        children: Dict[str, List[str]] = {}
+        for tweet_id in sorted(self.tweets, key=int):
+            if tweet_id == self.conversation_id:
+                continue
+            parent = self.parents.get(tweet_id)
+            if parent not in self.tweets:
+                parent = self.conversation_id
+            children.setdefault(parent, []).append(tweet_id)
+        return children
+
+    def summary(self, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+        """Render the reply tree as compact indented lines within `max_chars`"""
+        children = self.children()
+        lines: List[str] = []
+        used = 0
+        rendered = 0
+
+        def _line(tweet_id: str, depth: int) -> str:
+            tweet = self.tweets.get(tweet_id)
+            if tweet is None:
+                return "  " * depth + "[original tweet unavailable]"
+            author = tweet.get("author", {}).get("username") or tweet.get(
+                "author_id", "unknown"
+            )
+            text = " ".join(tweet["text"].split())
+            if len(text) > SUMMARY_TWEET_MAX_CHARS:
+                text = text[: SUMMARY_TWEET_MAX_CHARS - 1] + "…"
+            return f"{'  ' * depth}@{author}: {text}"
+
+        # Iterative depth-first walk so deep threads can't hit the recursion limit
+        stack = [(self.conversation_id, 0)]
+        while stack:
+            tweet_id, depth = stack.pop()
+            line = _line(tweet_id, depth)
+            if used + len(line) + 1 > max_chars:
+                break
+            lines.append(line)
+            used += len(line) + 1
+            if tweet_id in self.tweets:
+                rendered += 1
+            for child in reversed(children.get(tweet_id, [])):
+                stack.append((child, depth + 1))
+
+        omitted = len(self.tweets) - rendered
+        if omitted > 0:
+            lines.append(f"… ({omitted} more tweets omitted)")
+        return "\n".join(lines)
+
+
+# Conversation threads fetched during this process, keyed by conversation ID
+_conversation_cache: Dict[str, ConversationThread] = {}
+
+
+def fetch_conversation(
+    twitter_api: TwitterAPI, conversation_id: str
+) -> Tuple[ConversationThread, int]:
+    """
+    Fetch a conversation into the cache, only requesting tweets newer than the
+    newest one a previous search returned.
+
+    Returns:
+        Tuple[ConversationThread, int]: The cached thread and the number of newly added tweets.
+    """
+    conversation_id = str(conversation_id)
+    thread = _conversation_cache.get(conversation_id)
+    if thread is None:
+        thread = ConversationThread(conversation_id=conversation_id)
+    new_count = 0
+
+    request_kwargs = twitter_api.tweet_request_kwargs()
+
+    if conversation_id not in thread.tweets:
+        response = twitter_api.client_v2.get_tweet(conversation_id, **request_kwargs)
+        for tweet in twitter_api._format_tweets(response):
+            new_count += thread.add(tweet)
+
+    paginator = tweepy.Paginator(
+        twitter_api.client_v2.search_recent_tweets,
+        query=f"conversation_id:{conversation_id}",
+        since_id=thread.search_newest_id,
+        max_results=100,
+        limit=CONVERSATION_MAX_PAGES,
+        **request_kwargs,
+    )
+    for response in paginator:
+        for tweet in twitter_api._format_tweets(response):
+            new_count += thread.add(tweet)
+            if thread.search_newest_id is None or int(tweet["id"]) > int(
+                thread.search_newest_id
+            ):
+                thread.search_newest_id = str(tweet["id"])
+
+    thread.updated_at = datetime.now(timezone.utc).isoformat()
+    _conversation_cache[conversation_id] = thread
+    return thread, new_count
+
+
+def get_conversation_summary(
+    conversation_id: str, max_chars: int = SUMMARY_MAX_CHARS
+) -> str:
+    """Fetch (incrementally) a conversation and return its compacted summary"""
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        raise ValueError("Twitter API not initialized")
+    thread, _ = fetch_conversation(twitter_api, conversation_id)
+    return thread.summary(max_chars)
+
+
+@function_tool
+@profiled
+def get_conversation(
+    conversation_id: str, max_chars: int = SUMMARY_MAX_CHARS
+) -> ToolResponse:
+    """
+    Get an entire conversation thread as a compact reply tree.
+
+    Args:
+        conversation_id (str): The conversation ID (the ID of the tweet that started the thread).
+        max_chars (int): Maximum length of the returned summary (default: 2000).
+
+    Returns:
+        ToolResponse: On success, `data` contains:
+            - conversation_id (str): The conversation ID.
+            - tweet_count (int): Number of tweets known in the thread.
+            - new_count (int): Number of tweets fetched by this call.
+            - summary (str): Indented "@author: text" lines, replies nested under their parent.
+              Pass it as `context` to `create_social_content` when replying.
+            - retrieved_at (str): ISO 8601 UTC timestamp of the retrieval.
+    """
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        return ToolResponse(success=False, error="Twitter API not initialized")
+
+    try:
+        thread, new_count = fetch_conversation(twitter_api, conversation_id)
+        if not thread.tweets:
+            return ToolResponse(
+                success=False, error=f"Conversation '{conversation_id}' not found"
+            )
+
+        return ToolResponse(
+            success=True,
+            data={
+                "conversation_id": thread.conversation_id,
+                "tweet_count": len(thread.tweets),
+                "new_count": new_count,
+                "summary": thread.summary(max_chars),
+                "retrieved_at": thread.updated_at,
+            },
+        )
+    except Exception as e:
+        return ToolResponse.from_exception(e)
@@ -1,8 +1,11 @@
 import os
 from agents import function_tool
 
+from utils.profiling_utils import profiled
+
 
 @function_tool
+@profiled
 def read_dir_struct(directory_path: str) -> str:
     """Read the contents of a directory and return it in markdown format.
 
@@ -74,6 +77,7 @@ def read_dir_struct(directory_path: str) -> str:
 
 
 @function_tool
+@profiled
 def read_file_contents(file_path: str) -> str:
     """Read the contents of a file from the current directory.
 
@@ -91,6 +95,7 @@ def read_file_contents(file_path: str) -> str:
 
 
 @function_tool
+@profiled
 def create_new_file(file_path: str, content: str = "") -> str:
     """Create a new file at the specified path with optional content.
 
@@ -122,6 +127,7 @@ def create_new_file(file_path: str, content: str = "") -> str:
 
 
 @function_tool
+@profiled
 def overwrite_existing_file(file_path: str, content: str) -> str:
     """Overwrite the contents of an existing file at the specified path.
 
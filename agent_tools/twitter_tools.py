@@ -1,10 +1,132 @@
 import os
+import time
 import tweepy
+import requests
 from agents import function_tool
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal, Callable
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.shared_types import ToolResponse
+from utils.profiling_utils import profiled, InstrumentedClient, submit_in_context
+from utils.media_utils import MediaUploader, validate_media_set
+from utils.analytics_utils import TweetStore
+from utils.resilience_utils import ResilientClient
+from utils.tweet_text_utils import PostHistory, validate_tweet, split_into_thread
+
+
+TweetField = Literal[
+    "created_at",
+    "author_id",
+    "public_metrics",
+    "conversation_id",
+    "in_reply_to_user_id",
+    "referenced_tweets",
+    "lang",
+    "entities",
+]
+TweetExpansion = Literal[
+    "author_id",
+    "in_reply_to_user_id",
+    "referenced_tweets.id",
+    "referenced_tweets.id.author_id",
+]
+
+DEFAULT_TWEET_FIELDS: List[str] = [
+    "created_at",
+    "author_id",
+    "public_metrics",
+    "conversation_id",
+    "in_reply_to_user_id",
+    "referenced_tweets",
+]
+DEFAULT_EXPANSIONS: List[str] = ["author_id"]
+USER_FIELDS: List[str] = ["username", "name"]
+
+class RateLimitTracker:
+    """Tracks the rate-limit headers returned by each endpoint.
+
+    State is kept in a plain dict of plain dicts so it can be swapped for a
+    shared mapping when several processes use the same credentials.
+    """
+
+    def __init__(self, store: Optional[Dict[str, Dict[str, float]]] = None):
+        self._store = store if store is not None else {}
+
+    def update(self, endpoint: str, headers) -> None:
+        """Record the `x-rate-limit-*` headers of a response"""
+        try:
+            self._store[endpoint] = {
+                "limit": float(headers["x-rate-limit-limit"]),
+                "remaining": float(headers["x-rate-limit-remaining"]),
+                "reset": float(headers["x-rate-limit-reset"]),
+            }
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def exhausted(self, endpoint: str, reset: Optional[float] = None) -> None:
+        """Mark an endpoint as having no requests left until `reset` (epoch seconds)"""
+        state = dict(self._store.get(endpoint, {"limit": 1.0}))
+        state["remaining"] = 0.0
+        state["reset"] = reset or state.get("reset") or time.time() + 60
+        self._store[endpoint] = state
+
+    def headroom(self, endpoint: str) -> Optional[float]:
+        """Fraction of the current window's requests still available, if known"""
+        state = self._store.get(endpoint)
+        if not state or state["reset"] <= time.time():
+            return None
+        return state["remaining"] / state["limit"] if state["limit"] else None
+
+    def seconds_until_reset(self, endpoint: str) -> float:
+        state = self._store.get(endpoint)
+        if not state:
+            return 0.0
+        return max(0.0, state["reset"] - time.time())
+
+    def min_interval(self, endpoint: str) -> float:
+        """Smallest delay between requests that spreads the remaining budget over the window"""
+        state = self._store.get(endpoint)
+        wait = self.seconds_until_reset(endpoint)
+        if not state or wait == 0.0:
+            return 0.0
+        if state["remaining"] <= 0:
+            return wait
+        return wait / state["remaining"]
+
+
+class TrackedClient(tweepy.Client):
+    """
+    tweepy v2 Client that records every response's rate-limit headers in a
+    `RateLimitTracker`, keyed by "<method> <route>".
+
+    When the tracker says an endpoint's window is used up (e.g. by another worker
+    process sharing the credentials), a client that waits on rate limits sleeps
+    until the reset instead of spending a request to find out.
+    """
+
+    def __init__(self, *args, rate_limits: Callable[[], RateLimitTracker], **kwargs):
+        super().__init__(*args, **kwargs)
+        # Looked up per request, so a tracker swapped in later is picked up
+        self._rate_limits = rate_limits
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        tracker = self._rate_limits()
+        endpoint = f"{method} {route}"
+        if self.wait_on_rate_limit and tracker.headroom(endpoint) == 0:
+            time.sleep(tracker.seconds_until_reset(endpoint) + 1)
+        try:
+            response = super().request(method, route, params, json, user_auth)
+        except tweepy.TooManyRequests as e:
+            tracker.update(endpoint, e.response.headers)
+            raise
+        tracker.update(endpoint, response.headers)
+        return response
+
+
+def _wrap_client(client):
+    """Wrap a tweepy client with circuit breakers, timeouts and hedged reads, timed for tool profiles"""
+    return InstrumentedClient(ResilientClient(client))
 
 
 class TwitterAPI:
@@ -26,33 +148,307 @@ class TwitterAPI:
         auth_v1 = tweepy.OAuth1UserHandler(
             self.api_key, self.api_secret, self.access_token, self.access_token_secret
         )
-        self.api_v1 = tweepy.API(auth_v1, wait_on_rate_limit=True)
+        self.api_v1 = _wrap_client(tweepy.API(auth_v1, wait_on_rate_limit=True))
+
+        # Rate-limit state of every v2 request; worker pools swap in a shared store
+        self.rate_limits = RateLimitTracker()
 
         # Initialize v2 Client with user context (for tweet creation, reading, etc.)
-        self.client_v2 = tweepy.Client(
-            consumer_key=self.api_key,
-            consumer_secret=self.api_secret,
-            access_token=self.access_token,
-            access_token_secret=self.access_token_secret,
-            wait_on_rate_limit=True,
+        self.client_v2 = _wrap_client(
+            TrackedClient(
+                rate_limits=lambda: self.rate_limits,
+                consumer_key=self.api_key,
+                consumer_secret=self.api_secret,
+                access_token=self.access_token,
+                access_token_secret=self.access_token_secret,
+                wait_on_rate_limit=True,
+            )
+        )
+
+        # Same v2 Client, but returning raw HTTP responses so background pollers can
+        # read rate-limit headers and back off instead of sleeping inside tweepy
+        self.client_v2_raw = _wrap_client(
+            TrackedClient(
+                rate_limits=lambda: self.rate_limits,
+                consumer_key=self.api_key,
+                consumer_secret=self.api_secret,
+                access_token=self.access_token,
+                access_token_secret=self.access_token_secret,
+                return_type=requests.Response,
+                wait_on_rate_limit=False,
+            )
+        )
+        # Same v2 Client, but raising `tweepy.TooManyRequests` instead of waiting, so
+        # bulk actions can stop at the end of a rate-limit window
+        self.client_v2_nowait = _wrap_client(
+            TrackedClient(
+                rate_limits=lambda: self.rate_limits,
+                consumer_key=self.api_key,
+                consumer_secret=self.api_secret,
+                access_token=self.access_token,
+                access_token_secret=self.access_token_secret,
+                wait_on_rate_limit=False,
+            )
+        )
+        self.post_history = PostHistory()
+        self.media = MediaUploader(self.api_v1)
+        # Every tweet read through the tools or the poller feeds local analytics
+        self.analytics = TweetStore()
+        self._me_id: Optional[str] = None
+
+    def get_me_id(self) -> str:
+        """Return the authenticated user's ID (cached after the first lookup)"""
+        if self._me_id is None:
+            self._me_id = str(self.client_v2.get_me().data.id)
+        return self._me_id
+
+    def parse_raw_response(self, response: requests.Response) -> tweepy.Response:
+        """Convert a raw v2 tweet-list response into a `tweepy.Response`"""
+        payload = response.json()
+        includes = payload.get("includes", {})
+        return tweepy.Response(
+            data=[tweepy.Tweet(tweet) for tweet in payload.get("data", [])],
+            includes={
+                "users": [tweepy.User(user) for user in includes.get("users", [])],
+                "tweets": [tweepy.Tweet(tweet) for tweet in includes.get("tweets", [])],
+            },
+            errors=payload.get("errors", []),
+            meta=payload.get("meta", {}),
+        )
+
+    def tweet_request_kwargs(
+        self,
+        tweet_fields: Optional[List[str]] = None,
+        expansions: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Build the `tweet_fields`/`expansions`/`user_fields` kwargs for a v2 tweet read.
+
+        Defaults to DEFAULT_TWEET_FIELDS and DEFAULT_EXPANSIONS when not given.
+        Fields required by the requested expansions are added automatically.
+        """
+        tweet_fields = list(
+            DEFAULT_TWEET_FIELDS if tweet_fields is None else tweet_fields
         )
+        expansions = list(DEFAULT_EXPANSIONS if expansions is None else expansions)
 
-    def _format_tweet_data(self, tweet) -> Dict[str, Any]:
-        """Format tweet data for consistent output"""
+        for expansion in expansions:
+            source_field = expansion.split(".")[0]
+            if source_field not in tweet_fields:
+                tweet_fields.append(source_field)
+
+        kwargs: Dict[str, Any] = {"tweet_fields": tweet_fields}
+        if expansions:
+            kwargs["expansions"] = expansions
+            kwargs["user_fields"] = USER_FIELDS
+        return kwargs
+
+    def _format_tweets(self, response) -> List[Dict[str, Any]]:
+        """Format every tweet of a v2 response, joining `includes` locally"""
+        if not response.data:
+            return []
+
+        includes = response.includes or {}
+        users = {str(user.id): user for user in includes.get("users", [])}
+        referenced = {str(tweet.id): tweet for tweet in includes.get("tweets", [])}
+
+        tweets = response.data if isinstance(response.data, list) else [response.data]
+        return [self._format_tweet_data(tweet, users, referenced) for tweet in tweets]
+
+    def _format_user(self, user_id, users: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        user = users.get(str(user_id)) if user_id is not None else None
+        if user is None:
+            return None
+        return {"id": str(user.id), "username": user.username, "name": user.name}
+
+    def _format_tweet_data(
+        self,
+        tweet,
+        users: Optional[Dict[str, Any]] = None,
+        referenced: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Format tweet data for consistent output.
+
+        Only fields that were requested (and returned) are included. Authors and
+        referenced tweets found in the response `includes` are embedded inline.
+        """
+        users = users or {}
+        referenced = referenced or {}
+
+        data: Dict[str, Any] = {"id": tweet.id, "text": tweet.text}
+        if tweet.created_at:
+            data["created_at"] = tweet.created_at.isoformat()
+        for field in (
+            "author_id",
+            "public_metrics",
+            "conversation_id",
+            "in_reply_to_user_id",
+            "lang",
+            "entities",
+        ):
+            value = getattr(tweet, field, None)
+            if value is not None:
+                data[field] = value
+
+        author = self._format_user(tweet.author_id, users)
+        if author:
+            data["author"] = author
+
+        if tweet.referenced_tweets:
+            refs = []
+            for ref in tweet.referenced_tweets:
+                ref_data: Dict[str, Any] = {"type": ref.type, "id": ref.id}
+                ref_tweet = referenced.get(str(ref.id))
+                if ref_tweet is not None:
+                    ref_data["text"] = ref_tweet.text
+                    ref_author = self._format_user(ref_tweet.author_id, users)
+                    if ref_author:
+                        ref_data["author"] = ref_author
+                refs.append(ref_data)
+            data["referenced_tweets"] = refs
+
+        return data
+
+    def _client(self, wait_on_rate_limit: bool = True):
+        return self.client_v2 if wait_on_rate_limit else self.client_v2_nowait
+
+    def _now(self) -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    def get_user_id(self, username: str) -> str:
+        """Resolve a username (without @) to its user ID"""
+        user = self.client_v2.get_user(username=username)
+        if not user.data:
+            raise LookupError(f"User '{username}' not found")
+        return str(user.data.id)
+
+    def get_user_ids(self, usernames: List[str]) -> Dict[str, str]:
+        """Resolve up to 100 usernames per request; unknown usernames are omitted"""
+        user_ids = {}
+        for i in range(0, len(usernames), 100):
+            response = self.client_v2.get_users(usernames=usernames[i : i + 100])
+            for user in response.data or []:
+                user_ids[user.username.lower()] = str(user.id)
+        return user_ids
+
+    def post_tweet(
+        self,
+        content: str,
+        in_reply_to_tweet_id: Optional[str] = None,
+        media_ids: Optional[List[str]] = None,
+        quote_tweet_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        response = self.client_v2.create_tweet(
+            text=content,
+            in_reply_to_tweet_id=in_reply_to_tweet_id,
+            media_ids=media_ids or None,
+            quote_tweet_id=quote_tweet_id,
+        )
+        self.post_history.record(content, response.data["id"])
+        result = {
+            "tweet_id": response.data["id"],
+            "content": content,
+            "created_at": self._now(),
+            "in_reply_to": in_reply_to_tweet_id,
+            "media_ids": media_ids or [],
+        }
+        if quote_tweet_id:
+            result["quote_of"] = quote_tweet_id
+        return result
+
+    def delete_tweet(self, tweet_id: str) -> Dict[str, Any]:
+        response = self.client_v2.delete_tweet(tweet_id)
+        # Also covers tweets deleted when a thread is rolled back
+        self.post_history.remove(tweet_id)
         return {
-            "id": tweet.id,
-            "text": tweet.text,
-            "created_at": tweet.created_at.isoformat() if tweet.created_at else None,
-            "author_id": tweet.author_id,
-            "public_metrics": getattr(tweet, "public_metrics", {}),
-            "conversation_id": getattr(tweet, "conversation_id", None),
-            "in_reply_to_user_id": getattr(tweet, "in_reply_to_user_id", None),
+            "tweet_id": tweet_id,
+            "deleted": response.data["deleted"],
+            "deleted_at": self._now(),
+        }
+
+    def like_tweet(
+        self, tweet_id: str, wait_on_rate_limit: bool = True
+    ) -> Dict[str, Any]:
+        response = self._client(wait_on_rate_limit).like(tweet_id)
+        return {
+            "tweet_id": tweet_id,
+            "liked": response.data["liked"],
+            "liked_at": self._now(),
+        }
+
+    def unlike_tweet(
+        self, tweet_id: str, wait_on_rate_limit: bool = True
+    ) -> Dict[str, Any]:
+        response = self._client(wait_on_rate_limit).unlike(tweet_id)
+        return {
+            "tweet_id": tweet_id,
+            "liked": response.data["liked"],
+            "unliked_at": self._now(),
+        }
+
+    def retweet(
+        self, tweet_id: str, wait_on_rate_limit: bool = True
+    ) -> Dict[str, Any]:
+        response = self._client(wait_on_rate_limit).retweet(tweet_id)
+        return {
+            "tweet_id": tweet_id,
+            "retweet_id": response.data["id"],
+            "retweeted": response.data["retweeted"],
+            "retweeted_at": self._now(),
+        }
+
+    def unretweet(
+        self, tweet_id: str, wait_on_rate_limit: bool = True
+    ) -> Dict[str, Any]:
+        response = self._client(wait_on_rate_limit).unretweet(tweet_id)
+        return {
+            "tweet_id": tweet_id,
+            "retweeted": response.data["retweeted"],
+            "unretweeted_at": self._now(),
+        }
+
+    def follow_user(
+        self,
+        username: str,
+        user_id: Optional[str] = None,
+        wait_on_rate_limit: bool = True,
+    ) -> Dict[str, Any]:
+        user_id = user_id or self.get_user_id(username)
+        response = self._client(wait_on_rate_limit).follow_user(user_id)
+        return {
+            "username": username,
+            "user_id": user_id,
+            "following": response.data["following"],
+            "followed_at": self._now(),
+        }
+
+    def unfollow_user(
+        self,
+        username: str,
+        user_id: Optional[str] = None,
+        wait_on_rate_limit: bool = True,
+    ) -> Dict[str, Any]:
+        user_id = user_id or self.get_user_id(username)
+        response = self._client(wait_on_rate_limit).unfollow_user(user_id)
+        return {
+            "username": username,
+            "user_id": user_id,
+            "following": response.data["following"],
+            "unfollowed_at": self._now(),
         }
 
 
 # Initialize global Twitter API instance
 _twitter_api = None
 
+# Max concurrent requests issued by bulk tools. Engagement endpoints have small
+# per-user windows, so keep this low; targets left when a window runs out are
+# reported as skipped instead of waiting for the reset.
+BULK_MAX_CONCURRENCY = 5
+BULK_MAX_TARGETS = 100
+
+# Max characters of a tweet list sent back to the model; trailing tweets are cut
+TWEET_LIST_OUTPUT_BUDGET = 8000
+
 
 def _get_twitter_api() -> Optional[TwitterAPI]:
     global _twitter_api
@@ -66,15 +462,21 @@ def _get_twitter_api() -> Optional[TwitterAPI]:
 
 
 @function_tool
+@profiled
 def post_tweet(
-    content: str, in_reply_to_tweet_id: Optional[str] = None
+    content: str,
+    in_reply_to_tweet_id: Optional[str] = None,
+    media_paths: Optional[List[str]] = None,
 ) -> ToolResponse:
     """
     Post a tweet using the authenticated user's Twitter account.
 
     Args:
-        content (str): The tweet content (must be 280 characters or fewer).
+        content (str): The tweet content (280 weighted characters or fewer: URLs count
+            as 23, emoji and CJK characters count as 2).
         in_reply_to_tweet_id (Optional[str]): Optional tweet ID to reply to.
+        media_paths (Optional[List[str]]): Optional local image/GIF/video files to attach
+            (up to 4 images, or a single GIF or video).
 
     Returns:
         ToolResponse: On success, `data` contains:
@@ -82,36 +484,141 @@ def post_tweet(
             - content (str): The tweet text.
             - created_at (str): ISO 8601 UTC timestamp.
             - in_reply_to (Optional[str]): Replied tweet ID, if applicable.
+            - media_ids (List[str]): IDs of the attached media.
     """
     twitter_api = _get_twitter_api()
     if not twitter_api:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
-    if len(content) > 280:
-        return ToolResponse(
-            success=False, error=f"Tweet too long: {len(content)} characters (max 280)"
-        )
+    validation = validate_tweet(content, history=twitter_api.post_history)
+    if not validation.valid:
+        return ToolResponse(success=False, error="; ".join(validation.errors))
 
     try:
-        response = twitter_api.client_v2.create_tweet(
-            text=content, in_reply_to_tweet_id=in_reply_to_tweet_id
-        )
+        media_ids = None
+        if media_paths:
+            validate_media_set(media_paths)
+            uploads = twitter_api.media.upload_many(media_paths)
+            media_ids = [upload["media_id"] for upload in uploads]
 
         return ToolResponse(
             success=True,
-            data={
-                "tweet_id": response.data["id"],
-                "content": content,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "in_reply_to": in_reply_to_tweet_id,
-            },
+            data=twitter_api.post_tweet(content, in_reply_to_tweet_id, media_ids),
         )
+    except Exception as e:
+        return ToolResponse.from_exception(e)
+
+
+@function_tool
+@profiled
+def upload_media(file_paths: List[str]) -> ToolResponse:
+    """
+    Upload local media files ahead of posting. Files already uploaded (same content)
+    within their validity window are not uploaded again.
+
+    Args:
+        file_paths (List[str]): Local image, GIF or video files to upload.
+
+    Returns:
+        ToolResponse: On success, `data` contains:
+            - media (List[dict]): One entry per file with `file_path`, `media_id`,
+              `category` and `cached` (whether an earlier upload was reused).
+            - count (int): Number of files uploaded.
+    """
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        return ToolResponse(success=False, error="Twitter API not initialized")
+
+    try:
+        media = twitter_api.media.upload_many(file_paths)
+        return ToolResponse(success=True, data={"media": media, "count": len(media)})
+    except Exception as e:
+        return ToolResponse.from_exception(e)
+
+
+@function_tool
+@profiled
+def post_thread(
+    content: str, in_reply_to_tweet_id: Optional[str] = None, numbered: bool = True
+) -> ToolResponse:
+    """
+    Post long content as a thread: split on sentence boundaries into tweets that each
+    fit the length limit, and post them as a reply chain. If any tweet fails, the
+    tweets already posted are deleted so no partial thread is left behind.
+
+    Args:
+        content (str): The full thread content (any length).
+        in_reply_to_tweet_id (Optional[str]): Optional tweet ID the first tweet replies to.
+        numbered (bool): Whether to append " i/n" to each tweet (default: True).
+
+    Returns:
+        ToolResponse: On success, `data` contains:
+            - tweet_ids (List[str]): IDs of the posted tweets, in thread order.
+            - segments (List[str]): The text of each posted tweet.
+            - count (int): Number of tweets in the thread.
+            - created_at (str): ISO 8601 UTC timestamp.
+    """
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        return ToolResponse(success=False, error="Twitter API not initialized")
+
+    segments = split_into_thread(content, numbered=numbered)
 
+    # Validate every segment locally before the first request is sent
+    for i, segment in enumerate(segments, start=1):
+        validation = validate_tweet(segment, history=twitter_api.post_history)
+        if not validation.valid:
+            return ToolResponse(
+                success=False,
+                error=f"Segment {i} invalid: {'; '.join(validation.errors)}",
+            )
+
+    tweet_ids: List[str] = []
+    reply_to = in_reply_to_tweet_id
+    try:
+        # Each tweet must reply to the previous one, so posts go out back to back
+        for segment in segments:
+            reply_to = twitter_api.post_tweet(segment, reply_to)["tweet_id"]
+            tweet_ids.append(reply_to)
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        rollback_errors = []
+
+        def _rollback(tweet_id: str) -> None:
+            try:
+                twitter_api.delete_tweet(tweet_id)
+            except Exception as delete_error:
+                rollback_errors.append(f"{tweet_id}: {delete_error}")
+
+        if tweet_ids:
+            with ThreadPoolExecutor(
+                max_workers=min(BULK_MAX_CONCURRENCY, len(tweet_ids))
+            ) as executor:
+                for future in [
+                    submit_in_context(executor, _rollback, tweet_id)
+                    for tweet_id in tweet_ids
+                ]:
+                    future.result()
+
+        error = f"Posting segment {len(tweet_ids) + 1}/{len(segments)} failed: {e}"
+        if tweet_ids:
+            error += f". Rolled back {len(tweet_ids) - len(rollback_errors)} tweets"
+        if rollback_errors:
+            error += f"; could not delete {', '.join(rollback_errors)}"
+        return ToolResponse(success=False, error=error)
+
+    return ToolResponse(
+        success=True,
+        data={
+            "tweet_ids": tweet_ids,
+            "segments": segments,
+            "count": len(tweet_ids),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
 
 
 @function_tool
+@profiled
 def delete_tweet(tweet_id: str) -> ToolResponse:
     """
     Delete a tweet using the authenticated user's Twitter account.
@@ -130,20 +637,13 @@ def delete_tweet(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.delete_tweet(tweet_id)
-        return ToolResponse(
-            success=True,
-            data={
-                "tweet_id": tweet_id,
-                "deleted": True,
-                "deleted_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.delete_tweet(tweet_id))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def like_tweet(tweet_id: str) -> ToolResponse:
     """
     Like a tweet using the authenticated user's Twitter account.
@@ -162,20 +662,13 @@ def like_tweet(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.like(tweet_id)
-        return ToolResponse(
-            success=True,
-            data={
-                "tweet_id": tweet_id,
-                "liked": response.data["liked"],
-                "liked_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.like_tweet(tweet_id))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def unlike_tweet(tweet_id: str) -> ToolResponse:
     """
     Unlike a tweet using the authenticated user's Twitter account.
@@ -194,20 +687,13 @@ def unlike_tweet(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.unlike(tweet_id)
-        return ToolResponse(
-            success=True,
-            data={
-                "tweet_id": tweet_id,
-                "liked": response.data["liked"],
-                "unliked_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.unlike_tweet(tweet_id))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def retweet(tweet_id: str) -> ToolResponse:
     """
     Retweet a tweet using the authenticated user's Twitter account.
@@ -227,21 +713,13 @@ def retweet(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.retweet(tweet_id)
-        return ToolResponse(
-            success=True,
-            data={
-                "tweet_id": tweet_id,
-                "retweet_id": response.data["id"],
-                "retweeted": response.data["retweeted"],
-                "retweeted_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.retweet(tweet_id))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def unretweet(tweet_id: str) -> ToolResponse:
     """
     Unretweet a tweet using the authenticated user's Twitter account.
@@ -260,20 +738,13 @@ def unretweet(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.unretweet(tweet_id)
-        return ToolResponse(
-            success=True,
-            data={
-                "tweet_id": tweet_id,
-                "retweeted": response.data["retweeted"],
-                "unretweeted_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.unretweet(tweet_id))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def follow_user(username: str) -> ToolResponse:
     """
     Follow a user using the authenticated user's Twitter account.
@@ -293,28 +764,13 @@ def follow_user(username: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        # First get the user ID from username
-        user = twitter_api.client_v2.get_user(username=username)
-        if not user.data:
-            return ToolResponse(success=False, error=f"User '{username}' not found")
-
-        user_id = user.data.id
-        response = twitter_api.client_v2.follow_user(user_id)
-
-        return ToolResponse(
-            success=True,
-            data={
-                "username": username,
-                "user_id": str(user_id),
-                "following": response.data["following"],
-                "followed_at": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        return ToolResponse(success=True, data=twitter_api.follow_user(username))
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def unfollow_user(username: str) -> ToolResponse:
     """
     Unfollow a user using the authenticated user's Twitter account.
@@ -334,39 +790,145 @@ def unfollow_user(username: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        # First get the user ID from username
-        user = twitter_api.client_v2.get_user(username=username)
-        if not user.data:
-            return ToolResponse(success=False, error=f"User '{username}' not found")
+        return ToolResponse(success=True, data=twitter_api.unfollow_user(username))
+    except Exception as e:
+        return ToolResponse.from_exception(e)
 
-        user_id = user.data.id
-        response = twitter_api.client_v2.unfollow_user(user_id)
 
+@function_tool
+@profiled
+def bulk_engage(
+    action: Literal["like", "unlike", "retweet", "unretweet", "follow", "unfollow"],
+    targets: List[str],
+) -> ToolResponse:
+    """
+    Apply the same engagement action to many tweets or users in a single call.
+    Stops at the end of the rate-limit window; remaining targets are skipped.
+
+    Args:
+        action (Literal["like", "unlike", "retweet", "unretweet", "follow", "unfollow"]):
+            The engagement action to perform on every target.
+        targets (List[str]): Tweet IDs for tweet actions, or usernames (without @)
+            for follow/unfollow. Duplicates are ignored (max 100).
+
+    Returns:
+        ToolResponse: On success, `data` contains:
+            - action (str): The action performed.
+            - columns (List[str]): Column names for `rows` ("target", "ok", "error").
+            - rows (List[list]): One row per target in input order.
+            - succeeded (int): Number of targets the action succeeded on.
+            - failed (int): Number of targets the action failed on.
+    """
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        return ToolResponse(success=False, error="Twitter API not initialized")
+
+    targets = list(dict.fromkeys(t.strip().lstrip("@") for t in targets if t.strip()))
+    if not targets:
+        return ToolResponse(success=False, error="No targets provided")
+    if len(targets) > BULK_MAX_TARGETS:
         return ToolResponse(
-            success=True,
-            data={
-                "username": username,
-                "user_id": str(user_id),
-                "following": response.data["following"],
-                "unfollowed_at": datetime.now(timezone.utc).isoformat(),
-            },
+            success=False,
+            error=f"Too many targets: {len(targets)} (max {BULK_MAX_TARGETS})",
         )
+
+    errors: Dict[str, Optional[str]] = {}
+    calls: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    try:
+        if action in ("follow", "unfollow"):
+            # One lookup request per 100 usernames instead of one per target
+            user_ids = twitter_api.get_user_ids(targets)
+            method = getattr(twitter_api, f"{action}_user")
+            for username in targets:
+                user_id = user_ids.get(username.lower())
+                if user_id is None:
+                    errors[username] = "User not found"
+                else:
+                    calls[username] = lambda u=username, i=user_id: method(
+                        u, user_id=i, wait_on_rate_limit=False
+                    )
+        else:
+            method = {
+                "like": twitter_api.like_tweet,
+                "unlike": twitter_api.unlike_tweet,
+                "retweet": twitter_api.retweet,
+                "unretweet": twitter_api.unretweet,
+            }[action]
+            for tweet_id in targets:
+                calls[tweet_id] = lambda t=tweet_id: method(
+                    t, wait_on_rate_limit=False
+                )
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
+
+    rate_limited = False
+
+    def _run(target: str) -> Optional[str]:
+        nonlocal rate_limited
+        # Once the window is exhausted, stop spending requests on the remaining targets
+        if rate_limited:
+            return "Skipped: rate limited"
+        try:
+            calls[target]()
+            return None
+        except tweepy.TooManyRequests:
+            rate_limited = True
+            return "Rate limited"
+        except Exception as e:
+            return str(e)
+
+    if calls:
+        with ThreadPoolExecutor(
+            max_workers=min(BULK_MAX_CONCURRENCY, len(calls))
+        ) as executor:
+            futures = {
+                target: submit_in_context(executor, _run, target) for target in calls
+            }
+            errors.update(
+                {target: future.result() for target, future in futures.items()}
+            )
+
+    rows = [[target, errors[target] is None, errors[target]] for target in targets]
+    succeeded = sum(1 for row in rows if row[1])
+
+    return ToolResponse(
+        success=succeeded > 0,
+        data={
+            "action": action,
+            "columns": ["target", "ok", "error"],
+            "rows": rows,
+            "succeeded": succeeded,
+            "failed": len(rows) - succeeded,
+        },
+        error=None if succeeded else "Action failed for all targets",
+    )
 
 
 @function_tool
-def search_tweets(query: str, max_results: int = 10) -> ToolResponse:
+@profiled
+def search_tweets(
+    query: str,
+    max_results: int = 10,
+    tweet_fields: Optional[List[TweetField]] = None,
+    expansions: Optional[List[TweetExpansion]] = None,
+) -> ToolResponse:
     """
     Search for tweets using the Twitter API.
 
     Args:
         query (str): The search query string.
         max_results (int): Maximum number of results to return (default: 10, max: 100).
+        tweet_fields (Optional[List[str]]): Tweet fields to fetch (default: created_at,
+            author_id, public_metrics, conversation_id, in_reply_to_user_id, referenced_tweets).
+        expansions (Optional[List[str]]): Objects to include in the same request
+            (default: author_id). Use "referenced_tweets.id" to embed quoted/replied tweets.
 
     Returns:
         ToolResponse: On success, `data` contains:
-            - tweets (list): List of tweet objects with tweet data.
+            - tweets (list): List of tweet objects with the requested fields, plus
+              `author` and `referenced_tweets` details joined from the expansions.
+              The model sees them as a `columns`/`rows` table.
             - count (int): Number of tweets returned.
             - query (str): The original search query.
             - searched_at (str): ISO 8601 UTC timestamp of the search.
@@ -380,13 +942,13 @@ def search_tweets(query: str, max_results: int = 10) -> ToolResponse:
 
     try:
         response = twitter_api.client_v2.search_recent_tweets(
-            query=query, max_results=max_results
+            query=query,
+            max_results=max_results,
+            **twitter_api.tweet_request_kwargs(tweet_fields, expansions),
         )
 
-        tweets = []
-        if response.data:
-            for tweet in response.data:
-                tweets.append(twitter_api._format_tweet_data(tweet))
+        tweets = twitter_api._format_tweets(response)
+        twitter_api.analytics.ingest(tweets)
 
         return ToolResponse(
             success=True,
@@ -396,22 +958,32 @@ def search_tweets(query: str, max_results: int = 10) -> ToolResponse:
                 "query": query,
                 "searched_at": datetime.now(timezone.utc).isoformat(),
             },
-        )
+        ).with_budget(TWEET_LIST_OUTPUT_BUDGET)
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
-def get_tweet_by_id(tweet_id: str) -> ToolResponse:
+@profiled
+def get_tweet_by_id(
+    tweet_id: str,
+    tweet_fields: Optional[List[TweetField]] = None,
+    expansions: Optional[List[TweetExpansion]] = None,
+) -> ToolResponse:
     """
     Get a specific tweet by its ID using the Twitter API.
 
     Args:
         tweet_id (str): The ID of the tweet to retrieve.
+        tweet_fields (Optional[List[str]]): Tweet fields to fetch (default: created_at,
+            author_id, public_metrics, conversation_id, in_reply_to_user_id, referenced_tweets).
+        expansions (Optional[List[str]]): Objects to include in the same request
+            (default: author_id). Use "referenced_tweets.id" to embed quoted/replied tweets.
 
     Returns:
         ToolResponse: On success, `data` contains:
-            - tweet (dict): The tweet object with all available data.
+            - tweet (dict): The tweet object with the requested fields, plus
+              `author` and `referenced_tweets` details joined from the expansions.
             - retrieved_at (str): ISO 8601 UTC timestamp of the retrieval.
     """
     twitter_api = _get_twitter_api()
@@ -419,14 +991,16 @@ def get_tweet_by_id(tweet_id: str) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        response = twitter_api.client_v2.get_tweet(tweet_id)
+        response = twitter_api.client_v2.get_tweet(
+            tweet_id, **twitter_api.tweet_request_kwargs(tweet_fields, expansions)
+        )
 
         if not response.data:
             return ToolResponse(
                 success=False, error=f"Tweet with ID '{tweet_id}' not found"
             )
 
-        tweet_data = twitter_api._format_tweet_data(response.data)
+        tweet_data = twitter_api._format_tweets(response)[0]
 
         return ToolResponse(
             success=True,
@@ -436,21 +1010,33 @@ def get_tweet_by_id(tweet_id: str) -> ToolResponse:
             },
         )
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
-def get_user_tweets(username: str, max_results: int = 10) -> ToolResponse:
+@profiled
+def get_user_tweets(
+    username: str,
+    max_results: int = 10,
+    tweet_fields: Optional[List[TweetField]] = None,
+    expansions: Optional[List[TweetExpansion]] = None,
+) -> ToolResponse:
     """
     Get tweets from a specific user using the Twitter API.
 
     Args:
         username (str): The username (without @) of the user whose tweets to retrieve.
         max_results (int): Maximum number of tweets to return (default: 10, max: 100).
+        tweet_fields (Optional[List[str]]): Tweet fields to fetch (default: created_at,
+            author_id, public_metrics, conversation_id, in_reply_to_user_id, referenced_tweets).
+        expansions (Optional[List[str]]): Objects to include in the same request
+            (default: none, the author is already known). Use "referenced_tweets.id"
+            to embed quoted/replied tweets.
 
     Returns:
         ToolResponse: On success, `data` contains:
-            - tweets (list): List of tweet objects from the user.
+            - tweets (list): List of tweet objects from the user. The model sees them
+              as a `columns`/`rows` table.
             - count (int): Number of tweets returned.
             - username (str): The username whose tweets were retrieved.
             - user_id (str): The user ID of the account.
@@ -471,15 +1057,17 @@ def get_user_tweets(username: str, max_results: int = 10) -> ToolResponse:
 
         user_id = user.data.id
 
-        # Get user's tweets
+        # Get user's tweets (the author is known, so don't expand it by default)
         response = twitter_api.client_v2.get_users_tweets(
-            user_id, max_results=max_results
+            user_id,
+            max_results=max_results,
+            **twitter_api.tweet_request_kwargs(
+                tweet_fields, [] if expansions is None else expansions
+            ),
         )
 
-        tweets = []
-        if response.data:
-            for tweet in response.data:
-                tweets.append(twitter_api._format_tweet_data(tweet))
+        tweets = twitter_api._format_tweets(response)
+        twitter_api.analytics.ingest(tweets)
 
         return ToolResponse(
             success=True,
@@ -490,12 +1078,13 @@ def get_user_tweets(username: str, max_results: int = 10) -> ToolResponse:
                 "user_id": str(user_id),
                 "retrieved_at": datetime.now(timezone.utc).isoformat(),
             },
-        )
+        ).with_budget(TWEET_LIST_OUTPUT_BUDGET)
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def get_my_profile() -> ToolResponse:
     """
     Get the authenticated user's profile information using the Twitter API.
@@ -545,26 +1134,38 @@ def get_my_profile() -> ToolResponse:
             },
         )
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
-def analyze_trending_topics(location_id: int = 1) -> ToolResponse:
+@profiled
+def analyze_trending_topics(
+    window_hours: int = 24, query: Optional[str] = None, top_n: int = 10
+) -> ToolResponse:
     """
-    Analyze trending topics using the Twitter API.
+    Analyze trends and engagement over tweets collected locally from searches,
+    timelines and polling.
 
     Args:
-        location_id (int): The location ID for trending topics (default: 1 for worldwide).
+        window_hours (int): Recent window to measure trends in (default: 24).
+        query (Optional[str]): If given, first search recent tweets for this query
+            (up to 100) and add them to the analyzed set.
+        top_n (int): Number of entries in each ranking (default: 10).
 
     Returns:
         ToolResponse: On success, `data` contains:
-            - trends (list): List of trending topics with:
-                - name (str): Topic name.
-                - query (str): Search query for the topic.
-                - tweet_volume (int): Number of tweets about this topic.
-                - url (str): Twitter URL for the topic.
-            - count (int): Number of trending topics returned.
-            - location_id (int): The location ID used for the search.
+            - window_hours (int): The window used.
+            - tweets_in_window (int): Number of tweets analyzed in the window.
+            - tweets_stored (int): Number of tweets collected in total.
+            - trending_terms (list): Terms with their `count` in the window and
+              `lift` over their usual frequency (higher is more unusual).
+            - top_hashtags (list): Most used hashtags in the window.
+            - hashtag_pairs (list): Hashtags most often used together in the window.
+            - engagement (dict): `mean_engagements` (likes, retweets, replies and
+              quotes per tweet), `mean_engagement_rate` (per impression, when
+              reported) and `top_tweets` in the window.
+            - hours (list): Tweets and mean engagements per UTC hour of day over
+              all collected tweets, best hour first.
             - analyzed_at (str): ISO 8601 UTC timestamp of the analysis.
     """
     twitter_api = _get_twitter_api()
@@ -572,18 +1173,33 @@ def analyze_trending_topics(location_id: int = 1) -> ToolResponse:
         return ToolResponse(success=False, error="Twitter API not initialized")
 
     try:
-        # Note: Twitter API v2 doesn't have trending topics endpoint
-        # This would require using v1.1 API or a different approach
-        # For now, returning a placeholder response
+        if query:
+            response = twitter_api.client_v2.search_recent_tweets(
+                query=query,
+                max_results=100,
+                **twitter_api.tweet_request_kwargs(None, []),
+            )
+            twitter_api.analytics.ingest(twitter_api._format_tweets(response))
+
+        analysis = twitter_api.analytics.analyze(
+            window_hours=window_hours, top_n=top_n
+        )
+        if not analysis["tweets_stored"]:
+            return ToolResponse(
+                success=False,
+                error="No tweets collected yet. Pass a `query` to collect some first",
+            )
+
         return ToolResponse(
-            success=False,
-            error="Trending topics analysis not available with current API setup",
+            success=True,
+            data={**analysis, "analyzed_at": datetime.now(timezone.utc).isoformat()},
         )
     except Exception as e:
-        return ToolResponse(success=False, error=str(e))
+        return ToolResponse.from_exception(e)
 
 
 @function_tool
+@profiled
 def generate_tweet_content(
     topic: str, style: str = "engaging", max_length: int = 280
 ) -> str:
@@ -2,13 +2,13 @@ from typing import List, Optional, Literal
 from pydantic import BaseModel
 from agents import Agent, ModelSettings
 
-from utils.agent_utils import custom_instructions
+from utils.agent_utils import custom_instructions, resolve_model
 
 
 class ContentCreatorAgentOutput(BaseModel):
     primary_content: str
     platform: Literal["twitter", "instagram", "email"]
-    content_type: Literal["tweet", "reply", "dm", "email", "story", "post"]
+    content_type: Literal["tweet", "thread", "reply", "dm", "email", "story", "post"]
     alternative_versions: Optional[List[str]] = None
 
 
@@ -18,6 +18,7 @@ def create_content_creator_agent() -> Agent:
     return Agent(
         name="Content Creator Agent",
         instructions=custom_instructions,
+        model=resolve_model("Content Creator Agent"),
         model_settings=ModelSettings(temperature=0.7),
         output_type=ContentCreatorAgentOutput,
     )
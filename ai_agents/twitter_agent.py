@@ -1,11 +1,14 @@
-from typing import Optional, Literal
+from typing import Optional, List, Literal
 from pydantic import BaseModel, model_validator
 from agents import Agent, ModelSettings
 
-from utils.agent_utils import custom_instructions
+from utils.agent_utils import custom_instructions, resolve_model
 from agent_tools.content_tools import create_social_content
+from agent_tools.conversation_tools import get_conversation
 from agent_tools.twitter_tools import (
     post_tweet,
+    post_thread,
+    upload_media,
     delete_tweet,
     like_tweet,
     unlike_tweet,
@@ -13,6 +16,7 @@ from agent_tools.twitter_tools import (
     unretweet,
     follow_user,
     unfollow_user,
+    bulk_engage,
     search_tweets,
     get_tweet_by_id,
     get_user_tweets,
@@ -34,12 +38,15 @@ class TwitterAgentOutput(BaseModel):
         "quote",
         "schedule",
         "analyze",
+        "bulk_engage",
     ]
     tweet_content: Optional[str] = None
     in_reply_to_id: Optional[str] = None
     recipient_user_id: Optional[str] = None
     target_user_id: Optional[str] = None
     tweet_id: Optional[str] = None
+    # Tweet IDs or usernames a `bulk_engage` action succeeded on
+    targets: Optional[List[str]] = None
     reasoning: str
 
     @model_validator(mode="after")
@@ -67,6 +74,9 @@ class TwitterAgentOutput(BaseModel):
         if action in {"follow", "unfollow"}:
             required("target_user_id")
 
+        if action == "bulk_engage":
+            required("targets")
+
         return self
 
 
@@ -76,9 +86,13 @@ def create_twitter_agent() -> Agent:
     return Agent(
         name="Twitter Agent",
         instructions=custom_instructions,
+        model=resolve_model("Twitter Agent"),
         tools=[
             create_social_content,
             post_tweet,
+            post_thread,
+            bulk_engage,
+            # upload_media,
             # delete_tweet,
             # like_tweet,
             # unlike_tweet,
@@ -89,8 +103,9 @@ def create_twitter_agent() -> Agent:
             # search_tweets,
             # get_tweet_by_id,
             # get_user_tweets,
+            # get_conversation,
             # get_my_profile,
-            # analyze_trending_topics,
+            analyze_trending_topics,
         ],
         model_settings=ModelSettings(temperature=0),
         handoff_description="A twitter agent that can fully execute actions on twitter",
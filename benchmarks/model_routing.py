@@ -0,0 +1,167 @@
+"""
+Compare latency and cost per completed action across model routing configurations.
+
+Runs the Twitter agent on a fixed set of requests for each configuration, with
+`post_tweet` replaced by a dry-run stub and other Twitter tools removed, so nothing
+is published.
+
+Usage:
+    uv run python -m benchmarks.model_routing
+    uv run python -m benchmarks.model_routing --repeat 3 --config gpt-4.1-mini:gpt-4.1
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from agents import Runner, function_tool
+
+from ai_agents.twitter_agent import create_twitter_agent
+from utils.agent_utils import AgentContext, MODEL_ROUTES, get_model_name
+from utils.shared_types import ToolResponse
+
+
+load_dotenv()
+
+REQUESTS = [
+    "Post a tweet about fresh organic strawberries",
+    "Post a tweet with a quick tip for storing leafy greens",
+    "Reply to tweet 1234567890 where a customer thanked us for the avocado tip",
+]
+
+# USD per 1M tokens (input, output); extend as needed
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# orchestration model : content model
+DEFAULT_CONFIGS = ["gpt-4.1:gpt-4.1", "gpt-4.1-mini:gpt-4.1", "gpt-4.1-nano:gpt-4.1"]
+
+
+@function_tool(name_override="post_tweet")
+def dry_run_post_tweet(
+    content: str, in_reply_to_tweet_id: Optional[str] = None
+) -> ToolResponse:
+    """
+    Post a tweet using the authenticated user's Twitter account.
+
+    Args:
+        content (str): The tweet content (280 weighted characters or fewer).
+        in_reply_to_tweet_id (Optional[str]): Optional tweet ID to reply to.
+    """
+    return ToolResponse(
+        success=True,
+        data={
+            "tweet_id": "0",
+            "content": content,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "in_reply_to": in_reply_to_tweet_id,
+        },
+    )
+
+
+def usage_cost(model_name: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    prices = MODEL_PRICES.get(model_name.removeprefix("litellm/"))
+    if prices is None:
+        return None
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+
+async def run_config(config: str, repeat: int, character: str) -> Dict[str, object]:
+    orchestration_model, content_model = config.split(":")
+    os.environ[MODEL_ROUTES["Twitter Agent"].env_var] = orchestration_model
+    os.environ[MODEL_ROUTES["Content Creator Agent"].env_var] = content_model
+
+    # Keep content generation real, but never publish anything
+    agent = create_twitter_agent()
+    agent = agent.clone(
+        tools=[tool for tool in agent.tools if tool.name == "create_social_content"]
+        + [dry_run_post_tweet]
+    )
+
+    latencies: List[float] = []
+    costs: List[float] = []
+    completed = 0
+    unpriced = False
+
+    for request in REQUESTS * repeat:
+        context = AgentContext(character_file=character)
+        started = time.perf_counter()
+        try:
+            result = await Runner.run(agent, request, context=context)
+        except Exception as e:
+            print(f"  ✗ {request[:40]}...: {e}")
+            continue
+        latencies.append(time.perf_counter() - started)
+        completed += 1
+
+        usage = result.context_wrapper.usage
+        cost = usage_cost(
+            get_model_name("Twitter Agent"), usage.input_tokens, usage.output_tokens
+        )
+        for agent_name, totals in context.model_usage.items():
+            nested_cost = usage_cost(
+                get_model_name(agent_name),
+                totals["input_tokens"],
+                totals["output_tokens"],
+            )
+            cost = None if cost is None or nested_cost is None else cost + nested_cost
+        if cost is None:
+            unpriced = True
+        else:
+            costs.append(cost)
+
+    return {
+        "config": config,
+        "completed": completed,
+        "attempted": len(REQUESTS) * repeat,
+        "p50_latency": statistics.median(latencies) if latencies else None,
+        "max_latency": max(latencies) if latencies else None,
+        "cost_per_action": (
+            sum(costs) / completed if completed and not unpriced else None
+        ),
+    }
+
+
+def _fmt(value: Optional[float], pattern: str) -> str:
+    return "n/a" if value is None else pattern.format(value)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--config",
+        action="append",
+        help='"<orchestration model>:<content model>" (repeatable)',
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--character", default="fresh_harvest.md")
+    args = parser.parse_args()
+
+    results = []
+    for config in args.config or DEFAULT_CONFIGS:
+        print(f"Running {config}...")
+        results.append(await run_config(config, args.repeat, args.character))
+
+    print()
+    print(f"{'config':<32} {'done':>7} {'p50 s':>8} {'max s':>8} {'$/action':>10}")
+    for result in results:
+        print(
+            f"{result['config']:<32} "
+            f"{result['completed']:>3}/{result['attempted']:<3} "
+            f"{_fmt(result['p50_latency'], '{:.2f}'):>8} "
+            f"{_fmt(result['max_latency'], '{:.2f}'):>8} "
+            f"{_fmt(result['cost_per_action'], '{:.5f}'):>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,217 @@
 import os
 import asyncio
+import argparse
 from dotenv import load_dotenv
 from agents import Runner
 
 from ai_agents.twitter_agent import create_twitter_agent
-from utils.agent_utils import AgentContext
+from agent_tools.twitter_tools import _get_twitter_api
+from utils.agent_utils import AgentContext, prompt_cache_report
 from utils.common_utils import handle_stream_events
+from utils.polling_utils import PollingEngine, render_batch_request
+from utils.triage_utils import TriagePipeline
+from utils.command_utils import parse_command, execute_command
+from utils.trace_utils import RunRecorder, load_run, load_runs, replay_run
+from utils.profiling_utils import profile_report
+from utils.worker_utils import WorkerPool, load_jobs
+from utils.character_utils import get_character_registry
+from utils.stream_utils import EventPipeline, StdoutSink, JsonLinesSink
 
 
 load_dotenv()
 
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Twitter AI agent.")
+    parser.add_argument(
+        "--character",
+        default="fresh_harvest.md",
+        help="Character profile file in characters/ (default: fresh_harvest.md)",
+    )
+    parser.add_argument(
+        "--poll",
+        nargs="+",
+        metavar="SOURCE",
+        help='Poll sources for new tweets instead of prompting: "mentions", "home" or "user:<username>"',
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="When polling a source for the first time, also process its recent tweets",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=5,
+        help="Max new tweets handled by a single agent run when polling (default: 5)",
+    )
+    parser.add_argument(
+        "--no-triage",
+        action="store_true",
+        help="Send every polled tweet to the agent, skipping the local spam/relevance filter",
+    )
+    parser.add_argument(
+        "--triage-threshold",
+        type=float,
+        default=0.0,
+        help="Min relevance score for polled tweets that don't address the account (default: 0.0)",
+    )
+    parser.add_argument(
+        "--command",
+        metavar="JSON",
+        help='Run a structured command directly, e.g. \'{"action_type": "like", "tweet_id": "123"}\'',
+    )
+    parser.add_argument(
+        "--no-fast-path",
+        action="store_true",
+        help='Always use the agent, even for simple requests like "like tweet 123"',
+    )
+    parser.add_argument(
+        "--list-runs",
+        action="store_true",
+        help="List recorded runs",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="RUN_ID",
+        help='Re-execute a recorded run ("last" for the most recent) against its recorded model and tool responses, offline',
+    )
+    parser.add_argument(
+        "--jobs-file",
+        metavar="PATH",
+        help='Run every job in a JSON lines file ({"request": ..., "character": ...} per line) across worker processes',
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        help="Worker processes for --jobs-file (default: one per CPU core)",
+    )
+    parser.add_argument(
+        "--profile-report",
+        action="store_true",
+        help="Print latency, payload size and error statistics of every tool",
+    )
+    parser.add_argument(
+        "--stream-text",
+        action="store_true",
+        help="Print model text and tool outputs as they stream in",
+    )
+    parser.add_argument(
+        "--events-file",
+        metavar="PATH",
+        help="Also append every stream event as a JSON line to this file",
+    )
+    return parser.parse_args()
+
+
+async def run_polling(args: argparse.Namespace):
+    """Watch the requested sources and run the agent on every new tweet."""
+
+    twitter_api = _get_twitter_api()
+    if not twitter_api:
+        return
+
+    twitter_agent = create_twitter_agent()
+
+    async def handle_jobs(jobs):
+        tweet_ids = ", ".join(str(job.tweet["id"]) for job in jobs)
+        print(f"\n📥 New tweets: {tweet_ids}")
+        request = render_batch_request(jobs)
+        recorder = RunRecorder(request, args.character, twitter_agent.name)
+        result = await Runner.run(
+            twitter_agent,
+            request,
+            context=AgentContext(character_file=args.character),
+            hooks=recorder,
+        )
+        recorder.save(result)
+        print(f"Action: {result.final_output.action_type}")
+        print(f"Reasoning: {result.final_output.reasoning}")
+
+    triage = None
+    if not args.no_triage:
+        triage = TriagePipeline(
+            threshold=args.triage_threshold, own_user_id=twitter_api.get_me_id()
+        )
+
+    engine = PollingEngine(
+        twitter_api,
+        handle_jobs,
+        sources=args.poll,
+        batch_size=args.batch_size,
+        backfill=args.backfill,
+        triage=triage,
+    )
+    print(f"Polling {', '.join(args.poll)} (Ctrl+C to stop)...")
+    await engine.run()
+
+
+def run_jobs(args: argparse.Namespace):
+    """Run a file of agent jobs across a pool of worker processes."""
+
+    jobs = load_jobs(args.jobs_file)
+    with WorkerPool(processes=args.workers) as pool:
+        print(f"Running {len(jobs)} jobs on {pool.processes} workers...")
+        results = pool.run(jobs)
+
+    order = {job.job_id: i for i, job in enumerate(jobs)}
+    for result in sorted(results, key=lambda result: order[result.job_id]):
+        status = result.action_type if result.success else f"failed: {result.error}"
+        print(f"{result.job_id}  worker {result.worker}  {result.duration:6.1f}s  {status}")
+    succeeded = sum(1 for result in results if result.success)
+    print(f"{succeeded}/{len(results)} jobs succeeded")
+
+
+def list_runs():
+    """Print a one-line summary of every recorded run."""
+
+    for run in load_runs():
+        output = run["final_output"] or {}
+        print(
+            f"{run['run_id']}  {run['started_at'][:19]}  {run['duration']:6.1f}s  "
+            f"{len(run['tool_calls'])} tools  {output.get('action_type', '-'):<8} "
+            f"{run['input'][:60]}"
+        )
+
+
+async def replay(run_id: str):
+    """Replay a recorded run offline and report whether the output still matches."""
+
+    trace = load_run(run_id)
+    print(f"🔁 Replaying run {trace['run_id']}: {trace['input']}")
+    report = await replay_run(trace, create_twitter_agent())
+
+    print(f"Matches recording: {'yes' if report['matches'] else 'no'}")
+    for mismatch in report["mismatches"]:
+        print(f"- {mismatch}")
+    print(f"Recorded duration: {report['recorded_duration']:.2f}s")
+    print(f"Replay duration: {report['replay_duration']:.3f}s")
+    print(f"Final output: {report['final_output']}")
+
+
 async def main():
     """Main function to run the Twitter AI agent."""
 
+    args = parse_args()
+
+    # Recorded runs and tool profiles can be inspected without any credentials
+    if args.list_runs:
+        list_runs()
+        return
+    if args.replay:
+        await replay(args.replay)
+        return
+    if args.profile_report:
+        print(profile_report())
+        return
+
     # Check if OpenAI and Twitter credentials are configured
     if not all(
         [
@@ -34,32 +233,84 @@ async def main():
 
     print("Twitter Agent Starting...")
 
-    # Create the Twitter agent (you can specify different character files)
-    twitter_agent = create_twitter_agent()
+    # Parse and validate every character profile up front, so a broken profile
+    # fails here rather than in the middle of a run
+    try:
+        characters = get_character_registry()
+        characters.get(args.character)
+    except (ValueError, LookupError) as e:
+        print(f"❌ {e}")
+        return
+
+    if args.poll:
+        await run_polling(args)
+        return
+
+    if args.jobs_file:
+        run_jobs(args)
+        return
 
     # Get request from user
-    request = input("Request: ").strip()
+    request = args.command or input("Request: ").strip()
     print(f"\n📝 Processing request: {request}")
     print()
 
+    # Structured commands don't need any reasoning, so skip the agent for them
+    command = None if args.no_fast_path else parse_command(request)
+    if args.command and command is None:
+        print("❌ Invalid command")
+        return
+    if command:
+        twitter_api = _get_twitter_api()
+        if not twitter_api:
+            return
+        response = execute_command(twitter_api, command)
+        if not response.success:
+            print(f"❌ Structured command failed: {response.error}")
+            return
+        print("--- Twitter Agent Output (fast path) ---")
+        print(f"Action: {response.data['action_type']}")
+        print(f"Reasoning: {response.data['reasoning']}")
+        return
+
+    # Create the Twitter agent (you can specify different character files)
+    twitter_agent = create_twitter_agent()
+
     # Run the agent
+    context = AgentContext(character_file=args.character)
+    recorder = RunRecorder(request, args.character, twitter_agent.name)
     result = Runner.run_streamed(
         starting_agent=twitter_agent,
         input=request,
-        context=AgentContext(character_file="fresh_harvest.md"),
+        context=context,
+        hooks=recorder,
     )
 
     # Handle stream events
-    await handle_stream_events(result)
+    sinks = [StdoutSink(show_text=args.stream_text, show_tool_output=args.stream_text)]
+    if args.events_file:
+        sinks.append(JsonLinesSink(args.events_file))
+    pipeline = EventPipeline(sinks)
+    try:
+        await handle_stream_events(result, pipeline)
+    finally:
+        await pipeline.close()
+
+    trace = recorder.save(result)
 
     print()
-    print("--- Twitter Agent Output ---")
+    print(f"--- Twitter Agent Output (run {trace['run_id']}) ---")
     print(f"Action: {result.final_output.action_type}")
     print(f"Reasoning: {result.final_output.reasoning}")
     if result.final_output.tweet_content:
         print(f"Content: {result.final_output.tweet_content}")
     print()
 
+    context.record_usage(twitter_agent.name, result.context_wrapper.usage)
+    print("--- Prompt Cache ---")
+    print(prompt_cache_report(context.model_usage))
+    print()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
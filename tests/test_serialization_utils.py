@@ -0,0 +1,63 @@
+import json
+
+from utils.serialization_utils import compact_dumps
+
+
+def _wide_tweet(tweet_id: int) -> dict:
+    return {
+        "id": str(tweet_id),
+        "text": f"Tweet {tweet_id} " + "long text " * 30,
+        "created_at": "2025-01-01T00:00:00Z",
+        "author": {"id": "42", "username": "grower", "name": "Green Grower"},
+        "conversation_id": str(tweet_id),
+        "public_metrics": {"like_count": 3, "retweet_count": 1, "reply_count": 0},
+        "referenced_tweets": [
+            {"type": "quoted", "id": "7"},
+            {"type": "replied_to", "id": "8"},
+        ],
+    }
+
+
+def _payload(count: int) -> dict:
+    return {
+        "success": True,
+        "data": {"tweets": [_wide_tweet(i) for i in range(count)], "count": count},
+    }
+
+
+def test_budget_drops_whole_rows_of_wide_tables():
+    text = compact_dumps(_payload(3), budget=800)
+    result = json.loads(text)
+    table = result["data"]["tweets"]
+
+    assert len(text) <= 800
+    assert table["columns"] == [
+        "id",
+        "text",
+        "created_at",
+        "author",
+        "conversation_id",
+        "public_metrics",
+        "referenced_tweets",
+    ]
+    assert all(len(row) == len(table["columns"]) for row in table["rows"])
+    omitted = 3 - len(table["rows"])
+    assert omitted > 0
+    assert result["truncated"] == f"{omitted} records omitted to fit the output budget"
+
+
+def test_budget_keeps_nested_tables_aligned():
+    text = compact_dumps(_payload(10), budget=1500)
+    table = json.loads(text)["data"]["tweets"]
+
+    for row in table["rows"]:
+        assert len(row) == len(table["columns"])
+        references = row[table["columns"].index("referenced_tweets")]
+        assert all(len(ref) == len(references["columns"]) for ref in references["rows"])
+
+
+def test_within_budget_is_untouched():
+    result = json.loads(compact_dumps(_payload(2), budget=10000))
+
+    assert "truncated" not in result
+    assert len(result["data"]["tweets"]["rows"]) == 2
@@ -1,24 +1,120 @@
-from agents import Agent, RunContextWrapper
-from dataclasses import dataclass
+import os
+from functools import lru_cache
+from agents import Agent, RunContextWrapper, Model
+from dataclasses import dataclass, field
+from typing import Dict
 from utils.common_utils import read_file
+from utils.character_utils import get_character_registry
+from utils.resilience_utils import ResilientModel
 
 @dataclass
 class AgentContext:
     character_file: str
+    # Token usage of nested agent runs (e.g. content creation), keyed by agent name
+    model_usage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record_usage(self, agent_name: str, usage) -> None:
+        totals = self.model_usage.setdefault(
+            agent_name,
+            {
+                "requests": 0,
+                "input_tokens": 0,
+                "cached_input_tokens": 0,
+                "output_tokens": 0,
+            },
+        )
+        totals["requests"] += usage.requests
+        totals["input_tokens"] += usage.input_tokens
+        totals["cached_input_tokens"] += cached_input_tokens(usage)
+        totals["output_tokens"] += usage.output_tokens
+
+
+def cached_input_tokens(usage) -> int:
+    """Input tokens served from the provider's prompt cache (0 if not reported)."""
+    details = getattr(usage, "input_tokens_details", None)
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+def prompt_cache_report(model_usage: Dict[str, Dict[str, int]]) -> str:
+    """Format the prompt-cache hit rate of each agent in `AgentContext.model_usage`."""
+    lines = []
+    for agent_name, totals in model_usage.items():
+        input_tokens = totals["input_tokens"]
+        hit_rate = totals["cached_input_tokens"] / input_tokens if input_tokens else 0.0
+        lines.append(
+            f"{agent_name}: {totals['cached_input_tokens']}/{input_tokens} input "
+            f"tokens cached ({hit_rate:.0%}) over {totals['requests']} requests"
+        )
+    return "\n".join(lines)
+
+
+@dataclass
+class ModelRoute:
+    env_var: str
+    default: str
+
+
+# Orchestration only picks tools, so it runs on a small fast model; content
+# generation is where a stronger model pays off
+MODEL_ROUTES: Dict[str, ModelRoute] = {
+    "Twitter Agent": ModelRoute(env_var="TWITTER_AGENT_MODEL", default="gpt-4.1-mini"),
+    "Content Creator Agent": ModelRoute(
+        env_var="CONTENT_CREATOR_MODEL", default="gpt-4.1"
+    ),
+}
+
+
+def get_model_name(agent_name: str) -> str:
+    """Return the configured model name for an agent (env var override or default)."""
+    if agent_name not in MODEL_ROUTES:
+        raise ValueError(f"Agent {agent_name} not found")
+    route = MODEL_ROUTES[agent_name]
+    return os.getenv(route.env_var) or route.default
+
+
+def resolve_model(agent_name: str) -> Model:
+    """Resolve the model an agent should run on.
+
+    Names prefixed with "litellm/" (e.g. "litellm/anthropic/claude-3-5-haiku-latest")
+    are served through LiteLLM; anything else is an OpenAI model name. Either way the
+    model is wrapped with a circuit breaker and a per-call time budget.
+    """
+    model_name = get_model_name(agent_name)
+    if model_name.startswith("litellm/"):
+        from agents.extensions.models.litellm_model import LitellmModel
+
+        return ResilientModel(LitellmModel(model=model_name.removeprefix("litellm/")))
+    return ResilientModel(model_name)
+
+
+INSTRUCTION_FILES = {
+    "Twitter Agent": "twitter_agent_instructions.md",
+    "Content Creator Agent": "content_creator_agent_instructions.md",
+}
+
+
+@lru_cache(maxsize=None)
+def build_instructions(instructions_file: str, character_file: str) -> str:
+    """Assemble the static part of an agent's prompt.
+
+    The result is cached so every turn sends a byte-identical system prompt for the
+    same agent and character, which keeps it eligible for provider prefix caching.
+    Anything that varies per request belongs in the input, never in here. The
+    character comes from the preloaded registry in its compiled form.
+    """
+    return (
+        read_file(f"ai_agents/{instructions_file}").rstrip()
+        + "\n\n"
+        + get_character_registry().get(character_file).prompt
+    )
+
 
 def custom_instructions(
     run_context: RunContextWrapper[AgentContext], agent: Agent[AgentContext]
 ) -> str:
-    character_file = run_context.context.character_file
-    instructions_file = ""
-
-    if agent.name == "Twitter Agent":
-        instructions_file = "twitter_agent_instructions.md"
-    elif agent.name == "Content Creator Agent":
-        instructions_file = "content_creator_agent_instructions.md"
-    else:
+    if agent.name not in INSTRUCTION_FILES:
         raise ValueError(f"Agent {agent.name} not found")
 
-    return read_file(f"ai_agents/{instructions_file}") + read_file(
-        f"characters/{character_file}"
-    )
\ No newline at end of file
+    return build_instructions(
+        INSTRUCTION_FILES[agent.name], run_context.context.character_file
+    )
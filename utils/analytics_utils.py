@@ -0,0 +1,294 @@
+import os
+import re
+import json
+import time
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import combinations
+from typing import Optional, Dict, Any, List, Tuple
+
+from utils.common_utils import get_data_path, file_lock
+
+
+# Tweets older than this are ignored by analyses and dropped when the log is compacted
+ANALYTICS_RETENTION_DAYS = 30
+
+# Baseline period that recent term frequencies are compared against
+TREND_BASELINE_HOURS = 7 * 24
+
+# Terms seen fewer times than this in the window are never reported as trending
+TREND_MIN_COUNT = 3
+
+METRIC_COLUMNS = ["like_count", "retweet_count", "reply_count", "quote_count"]
+
+# Words of 3+ characters starting with a letter, not part of a hashtag or mention
+TERM_PATTERN = re.compile(r"(?<![#@\w])[^\W\d_][\w']{2,}")
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+URL_PATTERN = re.compile(r"https?://\S+")
+STOPWORDS = frozenset(
+    """
+    about after all also and any are been but can can't could did does don't for
+    from get got had has have her here him his how i'm into it's its just like more
+    not now one only our out over she some than that that's the their them then
+    there these they this too was were what when where which who why will with
+    would you you're your
+    """.split()
+)
+
+
+def tokenize(text: str) -> Tuple[List[str], List[str]]:
+    """Split tweet text into lowercase terms and hashtags, skipping URLs, mentions and stopwords"""
+    text = URL_PATTERN.sub(" ", text.lower())
+    terms = [term for term in TERM_PATTERN.findall(text) if term not in STOPWORDS]
+    return terms, HASHTAG_PATTERN.findall(text)
+
+
+def _epoch(created_at: Optional[str]) -> float:
+    if not created_at:
+        return time.time()
+    return datetime.fromisoformat(created_at.replace("Z", "+00:00")).timestamp()
+
+
+class TweetStore:
+    """
+    Columnar store of ingested tweets with incrementally maintained aggregates.
+
+    Tweets are appended to a JSON lines log shared by every process. `refresh()`
+    reads only the lines added since the last refresh and folds them into the
+    columns and aggregates, so analyses never rescan the full history. Seeing a
+    tweet again updates its metrics in place.
+    """
+
+    def __init__(self, log_file: Optional[str] = None):
+        self.log_file = log_file or get_data_path("analytics_tweets.jsonl")
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._log_lines = 0
+        # Columns, one entry per tweet
+        self.ids: List[str] = []
+        self.created: array = array("d")
+        self.metrics: Dict[str, array] = {name: array("q") for name in METRIC_COLUMNS}
+        self.impressions: array = array("q")
+        self._rows: Dict[str, int] = {}
+        # Aggregates
+        self._term_buckets: Dict[int, Counter] = {}
+        self._hashtag_buckets: Dict[int, Counter] = {}
+        self._pair_buckets: Dict[int, Counter] = {}
+        self.hour_tweets: array = array("q", [0] * 24)
+        self.hour_engagements: array = array("q", [0] * 24)
+
+    def ingest(self, tweets: List[Dict[str, Any]]) -> None:
+        """Append formatted tweets (as returned by the tweet tools) to the log"""
+        lines = []
+        for tweet in tweets:
+            metrics = tweet.get("public_metrics") or {}
+            row = {
+                "id": str(tweet["id"]),
+                "created_at": tweet.get("created_at"),
+                "text": tweet.get("text", ""),
+                "metrics": [metrics.get(name, 0) for name in METRIC_COLUMNS],
+                "impressions": metrics.get("impression_count", 0),
+            }
+            lines.append(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+        if not lines:
+            return
+        with file_lock(self.log_file), open(self.log_file, "a") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _engagements(self, row: int) -> int:
+        return sum(self.metrics[name][row] for name in METRIC_COLUMNS)
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        tweet_id = entry["id"]
+        row = self._rows.get(tweet_id)
+        if row is not None:
+            # Seen before: only the metrics change
+            hour = int(self.created[row] // 3600) % 24
+            self.hour_engagements[hour] -= self._engagements(row)
+            for name, value in zip(METRIC_COLUMNS, entry["metrics"]):
+                self.metrics[name][row] = value
+            self.impressions[row] = entry["impressions"]
+            self.hour_engagements[hour] += self._engagements(row)
+            return
+
+        created = _epoch(entry["created_at"])
+        row = len(self.ids)
+        self._rows[tweet_id] = row
+        self.ids.append(tweet_id)
+        self.created.append(created)
+        for name, value in zip(METRIC_COLUMNS, entry["metrics"]):
+            self.metrics[name].append(value)
+        self.impressions.append(entry["impressions"])
+
+        hour = int(created // 3600) % 24
+        self.hour_tweets[hour] += 1
+        self.hour_engagements[hour] += self._engagements(row)
+
+        bucket = int(created // 3600)
+        terms, hashtags = tokenize(entry["text"])
+        self._term_buckets.setdefault(bucket, Counter()).update(set(terms))
+        unique_hashtags = sorted(set(hashtags))
+        self._hashtag_buckets.setdefault(bucket, Counter()).update(unique_hashtags)
+        self._pair_buckets.setdefault(bucket, Counter()).update(
+            combinations(unique_hashtags, 2)
+        )
+
+    def refresh(self) -> int:
+        """Fold log lines written since the last refresh into the store.
+
+        Returns:
+            int: Number of log lines read.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.log_file)
+            except FileNotFoundError:
+                return 0
+            # The log was compacted (replaced) by another process: start over
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reset()
+                self._inode = stat.st_ino
+
+            read = 0
+            with open(self.log_file, "rb") as file:
+                file.seek(self._offset)
+                for line in file:
+                    # Skip a line still being written by another process
+                    if not line.endswith(b"\n"):
+                        break
+                    self._offset += len(line)
+                    if line.strip():
+                        self._add(json.loads(line))
+                        read += 1
+            self._log_lines += read
+            return read
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per tweet, dropping expired tweets"""
+        cutoff = time.time() - ANALYTICS_RETENTION_DAYS * 86400
+        with file_lock(self.log_file):
+            latest: Dict[str, str] = {}
+            with open(self.log_file, "r") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if _epoch(entry["created_at"]) >= cutoff:
+                            latest[entry["id"]] = line
+            tmp_path = f"{self.log_file}.tmp"
+            with open(tmp_path, "w") as file:
+                file.writelines(latest.values())
+            os.replace(tmp_path, self.log_file)
+        self.refresh()
+
+    def _window(
+        self, buckets: Dict[int, Counter], start_hour: int, end_hour: int
+    ) -> Counter:
+        total: Counter = Counter()
+        for bucket, counts in buckets.items():
+            if start_hour <= bucket < end_hour:
+                total.update(counts)
+        return total
+
+    def analyze(
+        self, window_hours: int = 24, top_n: int = 10, now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze the stored tweets.
+
+        Args:
+            window_hours (int): Size of the recent window that trends are measured in.
+            top_n (int): Number of entries in each ranking.
+            now (Optional[float]): End of the window (epoch seconds, default: now).
+
+        Returns:
+            Dict[str, Any]: `trending_terms` (recent count and lift over the baseline
+                rate), `top_hashtags`, `hashtag_pairs` (co-occurrence in the window),
+                `engagement` over the window and `hours` (UTC time-of-day performance
+                over all stored tweets, best first).
+        """
+        self.refresh()
+        if self._log_lines > 2 * len(self.ids) + 1000:
+            self.compact()
+
+        now = now or time.time()
+        end_hour = int(now // 3600) + 1
+        start_hour = end_hour - window_hours
+        baseline_start = start_hour - TREND_BASELINE_HOURS
+
+        recent_terms = self._window(self._term_buckets, start_hour, end_hour)
+        baseline_terms = self._window(self._term_buckets, baseline_start, start_hour)
+        # Lift of the recent count over what the baseline rate predicts (add-one smoothed)
+        scale = window_hours / TREND_BASELINE_HOURS
+        trending = sorted(
+            (
+                (term, count, (count + 1) / (baseline_terms[term] * scale + 1))
+                for term, count in recent_terms.items()
+                if count >= TREND_MIN_COUNT
+            ),
+            key=lambda item: (-item[2], -item[1]),
+        )[:top_n]
+
+        recent_hashtags = self._window(self._hashtag_buckets, start_hour, end_hour)
+        recent_pairs = self._window(self._pair_buckets, start_hour, end_hour)
+
+        window_start = start_hour * 3600
+        rows = [row for row, created in enumerate(self.created) if created >= window_start]
+        engagements = [self._engagements(row) for row in rows]
+        rated = [
+            engagements[i] / self.impressions[row]
+            for i, row in enumerate(rows)
+            if self.impressions[row]
+        ]
+        top_rows = sorted(range(len(rows)), key=lambda i: -engagements[i])[:top_n]
+
+        hours = sorted(
+            (
+                {
+                    "hour_utc": hour,
+                    "tweets": self.hour_tweets[hour],
+                    "mean_engagements": round(
+                        self.hour_engagements[hour] / self.hour_tweets[hour], 2
+                    ),
+                }
+                for hour in range(24)
+                if self.hour_tweets[hour]
+            ),
+            key=lambda item: -item["mean_engagements"],
+        )
+
+        return {
+            "window_hours": window_hours,
+            "tweets_in_window": len(rows),
+            "tweets_stored": len(self.ids),
+            "trending_terms": [
+                {"term": term, "count": count, "lift": round(lift, 2)}
+                for term, count, lift in trending
+            ],
+            "top_hashtags": [
+                {"hashtag": hashtag, "count": count}
+                for hashtag, count in recent_hashtags.most_common(top_n)
+            ],
+            "hashtag_pairs": [
+                {"hashtags": list(pair), "count": count}
+                for pair, count in recent_pairs.most_common(top_n)
+            ],
+            "engagement": {
+                "mean_engagements": (
+                    round(sum(engagements) / len(engagements), 2) if engagements else None
+                ),
+                "mean_engagement_rate": (
+                    round(sum(rated) / len(rated), 4) if rated else None
+                ),
+                "top_tweets": [
+                    {"id": self.ids[rows[i]], "engagements": engagements[i]}
+                    for i in top_rows
+                ],
+            },
+            "hours": hours,
+        }
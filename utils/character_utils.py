@@ -0,0 +1,221 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Union
+
+from utils.common_utils import read_file
+
+
+CHARACTERS_DIR = "characters"
+
+# Fields every profile must define
+REQUIRED_FIELDS = ["company_name", "tone", "voice", "mission", "hashtags"]
+
+# Fields holding comma-separated lists
+LIST_FIELDS = {
+    "target_audience",
+    "topics_to_cover",
+    "topics_to_avoid",
+    "posting_style",
+    "auto_reject",
+}
+
+# Shorter labels used in the compiled prompt
+PROMPT_LABELS = {
+    "company_name": "Brand",
+    "business_type": "Business",
+    "key_offering": "Offering",
+    "target_audience": "Audience",
+    "topics_to_cover": "Cover",
+    "topics_to_avoid": "Avoid",
+    "posting_style": "Formats",
+    "key_messages": "Key messages",
+    "auto_reject": "Never post",
+    "goals": "Goals",
+    "metrics": "Success metrics",
+}
+
+SECTION_PATTERN = re.compile(r"^##\s+(.+?)\s*$")
+FIELD_PATTERN = re.compile(r"^-\s+\*\*(.+?)\*\*:\s*(.*?)\s*$")
+ITEM_PATTERN = re.compile(r"^\s+-\s+(.+?)\s*$")
+
+FieldValue = Union[str, List[str]]
+
+
+def _field_key(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+
+
+@dataclass
+class Character:
+    """A brand profile parsed from `characters/<file_name>`"""
+
+    file_name: str
+    # Field values by snake_case key, grouped by their markdown section
+    sections: Dict[str, Dict[str, FieldValue]] = field(default_factory=dict)
+    prompt: str = ""
+
+    @property
+    def fields(self) -> Dict[str, FieldValue]:
+        return {
+            key: value
+            for section in self.sections.values()
+            for key, value in section.items()
+        }
+
+    def get(self, key: str) -> Optional[FieldValue]:
+        return self.fields.get(key)
+
+    @property
+    def name(self) -> str:
+        return self.get("company_name")
+
+    @property
+    def voice(self) -> str:
+        return self.get("voice")
+
+    @property
+    def tone(self) -> str:
+        return self.get("tone")
+
+    @property
+    def hashtags(self) -> List[str]:
+        return self.get("hashtags") or []
+
+    @property
+    def rules(self) -> List[str]:
+        return self.get("key_messages") or []
+
+    @property
+    def banned(self) -> List[str]:
+        """Topics the brand never posts about"""
+        return (self.get("auto_reject") or []) + (self.get("topics_to_avoid") or [])
+
+
+def parse_character(file_name: str, markdown: str) -> Character:
+    """
+    Parse a character profile written in the `characters/template.md` format.
+
+    Args:
+        file_name (str): The profile's file name, used in error messages.
+        markdown (str): The profile content.
+
+    Returns:
+        Character: The structured profile, with its compiled prompt.
+
+    Raises:
+        ValueError: If the profile is missing required fields, has fields outside a
+            `## Section` heading or has invalid values.
+    """
+    character = Character(file_name=file_name)
+    section: Optional[Dict[str, FieldValue]] = None
+    key: Optional[str] = None
+
+    for line_number, line in enumerate(markdown.splitlines(), start=1):
+        if not line.strip() or line.startswith("# "):
+            continue
+        section_match = SECTION_PATTERN.match(line)
+        field_match = FIELD_PATTERN.match(line)
+        item_match = ITEM_PATTERN.match(line)
+        if section_match:
+            section = character.sections.setdefault(section_match.group(1), {})
+            key = None
+        elif field_match:
+            key = _field_key(field_match.group(1))
+            if section is None:
+                # Only sectioned fields make it into the prompt
+                raise ValueError(
+                    f"{file_name}:{line_number}: field {key!r} must be under a "
+                    "'## Section' heading"
+                )
+            value = field_match.group(2)
+            if key == "hashtags":
+                section[key] = value.split()
+            elif key in LIST_FIELDS:
+                section[key] = [item.strip() for item in value.split(",") if item.strip()]
+            else:
+                section[key] = value
+        elif item_match and key:
+            # Sub-bullets turn the current field into a list
+            if not isinstance(section[key], list):
+                section[key] = [section[key]] if section[key] else []
+            section[key].append(item_match.group(1))
+        else:
+            raise ValueError(f"{file_name}:{line_number}: unrecognized line: {line!r}")
+
+    errors = [
+        f"missing {key}" for key in REQUIRED_FIELDS if not character.get(key)
+    ]
+    errors.extend(
+        f"hashtag {hashtag!r} must start with #"
+        for hashtag in character.hashtags
+        if not re.fullmatch(r"#\w+", hashtag)
+    )
+    if errors:
+        raise ValueError(f"Invalid character {file_name}: {'; '.join(errors)}")
+
+    character.prompt = compile_prompt(character)
+    return character
+
+
+def compile_prompt(character: Character) -> str:
+    """Render a profile as compact "Label: value" lines, without markdown markup"""
+    lines = ["# Character"]
+    for key, value in character.fields.items():
+        label = PROMPT_LABELS.get(key, key.replace("_", " ").capitalize())
+        if key == "hashtags":
+            value = " ".join(value)
+        elif isinstance(value, list):
+            value = "; ".join(value) if key == "key_messages" else ", ".join(value)
+        lines.append(f"{label}: {value}")
+    return "\n".join(lines) + "\n"
+
+
+class CharacterRegistry:
+    """
+    Every character profile, parsed, validated and compiled once.
+
+    Switching characters per job is a dictionary lookup; nothing is read from disk
+    after `load_all()`.
+    """
+
+    def __init__(self, directory: str = CHARACTERS_DIR):
+        self.directory = directory
+        self._characters: Dict[str, Character] = {}
+
+    def load_all(self) -> "CharacterRegistry":
+        """Load every `.md` profile in the directory, failing on the first invalid one"""
+        for file_name in sorted(os.listdir(self.directory)):
+            if file_name.endswith(".md"):
+                self._characters[file_name] = parse_character(
+                    file_name, read_file(os.path.join(self.directory, file_name))
+                )
+        return self
+
+    def names(self) -> List[str]:
+        return list(self._characters)
+
+    def get(self, file_name: str) -> Character:
+        """
+        Return a loaded character by file name (e.g. "fresh_harvest.md").
+
+        Raises:
+            LookupError: If no such character was loaded.
+        """
+        if file_name not in self._characters:
+            raise LookupError(
+                f"Character '{file_name}' not found. "
+                f"Available: {', '.join(self._characters) or 'none'}"
+            )
+        return self._characters[file_name]
+
+
+_character_registry: Optional[CharacterRegistry] = None
+
+
+def get_character_registry() -> CharacterRegistry:
+    """Return the process-wide registry, loading every profile on first use"""
+    global _character_registry
+    if _character_registry is None:
+        _character_registry = CharacterRegistry().load_all()
+    return _character_registry
@@ -0,0 +1,138 @@
+import re
+import json
+from typing import Optional, Literal
+from pydantic import BaseModel, ValidationError
+
+from ai_agents.twitter_agent import TwitterAgentOutput
+from agent_tools.twitter_tools import TwitterAPI
+from utils.shared_types import ToolResponse
+from utils.tweet_text_utils import validate_tweet
+
+
+class TwitterCommand(BaseModel):
+    """
+    A structured request that needs no reasoning and can skip the agent.
+
+    Mirrors the action types and fields of `TwitterAgentOutput`. `tweet_content` is
+    posted verbatim, so only send it when the text is final. Follow targets can be
+    given as `target_username`, which is resolved to `target_user_id` on execution.
+    """
+
+    action_type: Literal[
+        "tweet", "reply", "quote", "like", "retweet", "follow", "unfollow"
+    ]
+    tweet_content: Optional[str] = None
+    in_reply_to_id: Optional[str] = None
+    target_user_id: Optional[str] = None
+    target_username: Optional[str] = None
+    tweet_id: Optional[str] = None
+
+    def to_output(self, reasoning: str) -> TwitterAgentOutput:
+        return TwitterAgentOutput(
+            **self.model_dump(exclude_none=True, exclude={"target_username"}),
+            reasoning=reasoning,
+        )
+
+    def target(self) -> str:
+        """The follow target as shown to the user"""
+        if self.target_username:
+            return f"@{self.target_username}"
+        return f"user {self.target_user_id}"
+
+
+# Plain-text requests that map to a single tool call
+_COMMAND_PATTERNS = [
+    (
+        re.compile(r"^(like|retweet)\s+(?:tweet\s+)?(\d+)$", re.I),
+        "tweet_id",
+    ),
+    (
+        re.compile(r"^(follow|unfollow)\s+(?:user\s+)?@?(\w{1,15})$", re.I),
+        "target_username",
+    ),
+]
+
+
+def parse_command(request: str) -> Optional[TwitterCommand]:
+    """Parse a JSON command or a simple "like tweet 123" / "follow @foo" request.
+
+    Returns:
+        Optional[TwitterCommand]: The command, or None if the request needs the agent.
+    """
+    request = request.strip()
+    if request.startswith("{"):
+        try:
+            command = TwitterCommand.model_validate(json.loads(request))
+            # The username stands in for the ID it resolves to on execution
+            command.model_copy(
+                update={
+                    "target_user_id": command.target_user_id or command.target_username
+                }
+            ).to_output(reasoning="")
+            return command
+        except (json.JSONDecodeError, ValidationError):
+            return None
+
+    for pattern, field in _COMMAND_PATTERNS:
+        match = pattern.match(request)
+        if match:
+            return TwitterCommand(
+                action_type=match.group(1).lower(), **{field: match.group(2)}
+            )
+    return None
+
+
+def execute_command(twitter_api: TwitterAPI, command: TwitterCommand) -> ToolResponse:
+    """
+    Execute a command directly against the Twitter API, without any LLM turn.
+
+    Returns:
+        ToolResponse: On success, `data` holds the `TwitterAgentOutput` fields of the
+            action taken. On failure (including commands missing fields their action
+            requires), `error` says why nothing was done.
+    """
+    try:
+        if command.target_username and not command.target_user_id:
+            command = command.model_copy(
+                update={
+                    "target_user_id": twitter_api.get_user_id(command.target_username)
+                }
+            )
+        # Validates required fields the same way agent outputs are validated
+        command.to_output(reasoning="")
+
+        action = command.action_type
+        if action in {"tweet", "reply", "quote"}:
+            validation = validate_tweet(
+                command.tweet_content, history=twitter_api.post_history
+            )
+            if not validation.valid:
+                return ToolResponse(success=False, error="; ".join(validation.errors))
+            data = twitter_api.post_tweet(
+                command.tweet_content,
+                command.in_reply_to_id,
+                quote_tweet_id=command.tweet_id if action == "quote" else None,
+            )
+            kind = "quote tweet" if action == "quote" else "tweet"
+            result = f"Posted {kind} {data['tweet_id']}"
+        elif action == "like":
+            twitter_api.like_tweet(command.tweet_id)
+            result = f"Liked tweet {command.tweet_id}"
+        elif action == "retweet":
+            data = twitter_api.retweet(command.tweet_id)
+            result = f"Retweeted tweet {command.tweet_id} as {data['retweet_id']}"
+        elif action == "follow":
+            twitter_api.follow_user(
+                command.target_username, user_id=command.target_user_id
+            )
+            result = f"Followed {command.target()}"
+        else:
+            twitter_api.unfollow_user(
+                command.target_username, user_id=command.target_user_id
+            )
+            result = f"Unfollowed {command.target()}"
+    except Exception as e:
+        return ToolResponse.from_exception(e)
+
+    output = command.to_output(f"{result} (structured command, no agent run needed)")
+    return ToolResponse(success=True, data=output.model_dump(exclude_none=True))
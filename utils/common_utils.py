@@ -1,31 +1,41 @@
-from openai.types.responses import ResponseTextDeltaEvent
-
-
-async def handle_stream_events(result):
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and isinstance(
-            event.data, ResponseTextDeltaEvent
-        ):
-            # # raw text generations of model
-            # print(event.data.delta, end="", flush=True)
-            pass
-        elif event.type == "agent_updated_stream_event":
-            print("-- Agent Updated.")
-            print(event.new_agent.name)
-        elif event.type == "run_item_stream_event":
-            if event.item.type == "tool_call_item":
-                print("-- Tool Called.")
-                print(f"Tool name: {event.item.raw_item.name}")
-                print(f"Arguments: {event.item.raw_item.arguments}")
-            elif event.item.type == "tool_call_output_item":
-                # # raw tool call outputs
-                # print("-- Tool Output:")
-                # print(event.item.output)
-                pass
-            elif event.item.type == "message_output_item":
-                pass
-            else:
-                pass  # Ignore other event types
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from utils.stream_utils import EventPipeline, StdoutSink, event_to_record
+
+
+async def handle_stream_events(
+    result, pipeline: Optional[EventPipeline] = None, run_id: Optional[str] = None
+):
+    """Publish the events of a streamed run to an event pipeline.
+
+    Args:
+        result: The `RunResultStreaming` returned by `Runner.run_streamed`.
+        pipeline (Optional[EventPipeline]): Where to send the events. Defaults to a
+            console-only pipeline that is closed when the run ends; a pipeline passed
+            in is left open so it can be shared between runs.
+        run_id (Optional[str]): Optional ID added to every record.
+    """
+    owns_pipeline = pipeline is None
+    if owns_pipeline:
+        pipeline = EventPipeline([StdoutSink()])
+
+    try:
+        async for event in result.stream_events():
+            record = event_to_record(event, run_id)
+            if record is not None:
+                await pipeline.publish(record)
+    finally:
+        if owns_pipeline:
+            await pipeline.close()
 
 
 def read_file(file_path: str) -> str:
@@ -43,3 +53,77 @@ def read_file(file_path: str) -> str:
     """
     with open(f"{file_path}", "r") as file:
         return file.read()
+
+
+def get_data_path(*parts: str) -> str:
+    """Return a path inside the agent's local data directory, creating parent directories.
+
+    The directory defaults to `.agent_data` and can be changed with the
+    `TWITTER_AGENT_DATA_DIR` environment variable.
+
+    Args:
+        *parts (str): Path components relative to the data directory.
+
+    Returns:
+        str: The resulting path.
+    """
+    path = os.path.join(os.getenv("TWITTER_AGENT_DATA_DIR", ".agent_data"), *parts)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return path
+
+
+def read_json_file(file_path: str, default: Any = None) -> Any:
+    """Read a JSON file, returning `default` if it does not exist or is corrupt.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        default (Any): Value returned when the file cannot be read.
+
+    Returns:
+        Any: The decoded JSON content.
+    """
+    try:
+        with open(file_path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def write_json_file(file_path: str, data: Any) -> None:
+    """Atomically write `data` as JSON so readers never see a partial file.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        data (Any): JSON-serializable data to write.
+    """
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(file_path: str):
+    """Hold an exclusive lock on `file_path` across processes and threads.
+
+    Wrap read-modify-write cycles of files shared by several worker processes. The
+    lock is taken on a sibling `.lock` file; where `fcntl` is unavailable it is a no-op.
+
+    Args:
+        file_path (str): The path of the file being protected.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{file_path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,134 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+
+from utils.common_utils import (
+    get_data_path,
+    read_json_file,
+    write_json_file,
+    file_lock,
+)
+from utils.profiling_utils import submit_in_context
+
+
+MEDIA_CATEGORIES = {
+    ".jpg": "tweet_image",
+    ".jpeg": "tweet_image",
+    ".png": "tweet_image",
+    ".webp": "tweet_image",
+    ".gif": "tweet_gif",
+    ".mp4": "tweet_video",
+    ".mov": "tweet_video",
+}
+# Twitter accepts up to 4 images, or a single GIF or video, per tweet
+MAX_IMAGES_PER_TWEET = 4
+# Media IDs expire after 24h unless the upload response says otherwise
+DEFAULT_MEDIA_TTL_SECONDS = 24 * 3600
+# Don't reuse a media ID that will expire before the tweet is likely posted
+MEDIA_EXPIRY_MARGIN_SECONDS = 600
+MEDIA_UPLOAD_CONCURRENCY = 4
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def media_category(file_path: str) -> str:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in MEDIA_CATEGORIES:
+        raise ValueError(
+            f"Unsupported media type '{extension}' "
+            f"(supported: {', '.join(sorted(MEDIA_CATEGORIES))})"
+        )
+    return MEDIA_CATEGORIES[extension]
+
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 of the file content, read in chunks so large videos aren't loaded at once"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_media_set(file_paths: List[str]) -> None:
+    """Raise ValueError if the files can't be attached to a single tweet"""
+    categories = [media_category(path) for path in file_paths]
+    if len(categories) > MAX_IMAGES_PER_TWEET:
+        raise ValueError(f"At most {MAX_IMAGES_PER_TWEET} media files per tweet")
+    if len(categories) > 1 and any(c != "tweet_image" for c in categories):
+        raise ValueError("A GIF or video must be the only media in a tweet")
+    for path in file_paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Media file not found: {path}")
+
+
+class MediaUploader:
+    """
+    Uploads media through the v1.1 API with chunked (INIT/APPEND/FINALIZE) uploads.
+
+    Media IDs are cached by file content hash until they expire, so the same asset
+    is never uploaded twice within its validity window.
+    """
+
+    def __init__(self, api_v1, cache_file: Optional[str] = None):
+        self.api_v1 = api_v1
+        self.cache_file = cache_file or get_data_path("media_cache.json")
+        self._cache: Dict[str, Dict[str, Any]] = read_json_file(self.cache_file, {})
+        self._lock = threading.Lock()
+
+    def _cached(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(content_hash)
+        if entry and entry["expires_at"] - MEDIA_EXPIRY_MARGIN_SECONDS > time.time():
+            return entry
+        return None
+
+    def _store(self, content_hash: str, entry: Dict[str, Any]) -> None:
+        with self._lock, file_lock(self.cache_file):
+            now = time.time()
+            # Keep uploads cached by other worker processes in the meantime
+            merged = {**read_json_file(self.cache_file, {}), **self._cache}
+            self._cache = {
+                key: value for key, value in merged.items() if value["expires_at"] > now
+            }
+            self._cache[content_hash] = entry
+            write_json_file(self.cache_file, self._cache)
+
+    def upload(self, file_path: str) -> Dict[str, Any]:
+        """Upload a single file, reusing a cached media ID when possible.
+
+        Returns:
+            Dict[str, Any]: `media_id`, `file_path`, `category` and `cached` flag.
+        """
+        category = media_category(file_path)
+        content_hash = file_hash(file_path)
+
+        cached = self._cached(content_hash)
+        if cached:
+            return {**cached, "file_path": file_path, "cached": True}
+
+        # tweepy runs INIT/APPEND/FINALIZE and waits for async video processing
+        media = self.api_v1.media_upload(
+            filename=file_path, chunked=True, media_category=category
+        )
+        ttl = getattr(media, "expires_after_secs", None) or DEFAULT_MEDIA_TTL_SECONDS
+        entry = {
+            "media_id": str(media.media_id),
+            "category": category,
+            "expires_at": time.time() + ttl,
+        }
+        self._store(content_hash, entry)
+        return {**entry, "file_path": file_path, "cached": False}
+
+    def upload_many(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """Upload several files concurrently, returning results in input order"""
+        if len(file_paths) <= 1:
+            return [self.upload(path) for path in file_paths]
+        with ThreadPoolExecutor(
+            max_workers=min(MEDIA_UPLOAD_CONCURRENCY, len(file_paths))
+        ) as executor:
+            futures = [
+                submit_in_context(executor, self.upload, path) for path in file_paths
+            ]
+            return [future.result() for future in futures]
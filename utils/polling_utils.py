@@ -0,0 +1,292 @@
+import asyncio
+import time
+import tweepy
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+
+from agent_tools.twitter_tools import TwitterAPI
+from utils.common_utils import get_data_path, read_json_file, write_json_file
+from utils.triage_utils import TriagePipeline
+
+
+# Pages fetched per poll when catching up on a busy source (100 tweets per page)
+POLL_MAX_PAGES = 5
+
+
+@dataclass
+class PollJob:
+    """A newly seen tweet from a polled source"""
+
+    source: str
+    tweet: Dict[str, Any]
+
+    def describe(self) -> str:
+        author = self.tweet.get("author", {}).get("username") or self.tweet.get(
+            "author_id"
+        )
+        return (
+            f'@{author} wrote: "{self.tweet["text"]}" '
+            f"(tweet ID {self.tweet['id']}, "
+            f"conversation ID {self.tweet.get('conversation_id', self.tweet['id'])})"
+        )
+
+    def to_request(self) -> str:
+        """Render the job as a request for the Twitter agent"""
+        if self.source == "mentions":
+            return f"Reply to this mention if it warrants a response. {self.describe()}"
+        return (
+            f"Decide whether to engage with this tweet from {self.source}. "
+            f"{self.describe()}"
+        )
+
+
+def render_batch_request(jobs: List[PollJob]) -> str:
+    """Render several jobs as a single request, so one agent run handles the batch"""
+    if len(jobs) == 1:
+        return jobs[0].to_request()
+    lines = [
+        f"Handle each of the following {len(jobs)} new tweets. Reply to mentions "
+        "that warrant a response and engage with other tweets only where it fits "
+        "the brand. Summarize every action taken in your reasoning."
+    ]
+    for i, job in enumerate(jobs, start=1):
+        lines.append(f"{i}. [{job.source}] {job.describe()}")
+    return "\n".join(lines)
+
+
+JobHandler = Callable[[List[PollJob]], Awaitable[None]]
+
+
+class PollingEngine:
+    """
+    Polls mentions and timelines for new tweets and dispatches them to a handler.
+
+    Each source keeps a `since_id` checkpoint persisted to disk, so restarts never
+    re-fetch tweets that were already seen. A source with more new tweets than one
+    poll fetches is caught up over several polls without skipping any. Poll intervals shrink while a source is
+    active, grow while it is quiet, and never exceed the endpoint's rate-limit budget.
+    When a `triage` pipeline is given, only tweets that pass it are dispatched, in
+    batches of up to `batch_size` jobs.
+
+    Sources:
+        - "mentions": Tweets mentioning the authenticated user.
+        - "home": The authenticated user's home timeline.
+        - "user:<username>": Tweets posted by a specific user.
+    """
+
+    def __init__(
+        self,
+        twitter_api: TwitterAPI,
+        handler: JobHandler,
+        sources: List[str],
+        checkpoint_file: Optional[str] = None,
+        min_interval: float = 15.0,
+        max_interval: float = 300.0,
+        concurrency: int = 2,
+        batch_size: int = 1,
+        backfill: bool = False,
+        triage: Optional[TriagePipeline] = None,
+    ):
+        self.twitter_api = twitter_api
+        self.handler = handler
+        self.sources = sources
+        self.checkpoint_file = checkpoint_file or get_data_path("poll_checkpoints.json")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.backfill = backfill
+        self.triage = triage
+
+        self.checkpoints: Dict[str, Dict[str, str]] = self._load_checkpoints()
+        # Checkpoints from the last fetch of each source, saved once its tweets are queued
+        self._staged: Dict[str, Dict[str, str]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+        self._user_ids: Dict[str, str] = {}
+
+    def _load_checkpoints(self) -> Dict[str, Dict[str, str]]:
+        checkpoints = read_json_file(self.checkpoint_file, {})
+        # Older files only held each source's since_id
+        return {
+            source: value if isinstance(value, dict) else {"since_id": value}
+            for source, value in checkpoints.items()
+        }
+
+    def _user_id(self, source: str) -> str:
+        """The ID of the user whose mentions, timeline or tweets a source polls"""
+        if source not in self._user_ids:
+            if source in ("mentions", "home"):
+                self._user_ids[source] = self.twitter_api.get_me_id()
+            elif source.startswith("user:"):
+                username = source.split(":", 1)[1]
+                self._user_ids[source] = self.twitter_api.get_user_id(username)
+            else:
+                raise ValueError(f"Unknown poll source '{source}'")
+        return self._user_ids[source]
+
+    def _endpoint(self, source: str) -> Optional[str]:
+        """The source's rate-limit key, as recorded by `TrackedClient`, once known"""
+        user_id = self._user_ids.get(source)
+        if user_id is None:
+            return None
+        if source == "mentions":
+            return f"GET /2/users/{user_id}/mentions"
+        if source == "home":
+            return f"GET /2/users/{user_id}/timelines/reverse_chronological"
+        return f"GET /2/users/{user_id}/tweets"
+
+    def _fetch_page(
+        self,
+        source: str,
+        since_id: Optional[str],
+        until_id: Optional[str],
+        pagination_token: Optional[str],
+    ):
+        kwargs = dict(
+            since_id=since_id,
+            until_id=until_id,
+            pagination_token=pagination_token,
+            max_results=100,
+            **self.twitter_api.tweet_request_kwargs(),
+        )
+        client = self.twitter_api.client_v2_raw
+        user_id = self._user_id(source)
+
+        if source == "mentions":
+            return client.get_users_mentions(user_id, **kwargs)
+        if source == "home":
+            return client.get_home_timeline(**kwargs)
+        return client.get_users_tweets(user_id, **kwargs)
+
+    def fetch_new(self, source: str) -> List[Dict[str, Any]]:
+        """
+        Fetch tweets newer than the source's checkpoint, oldest first.
+
+        When pagination stops early (`POLL_MAX_PAGES` or a rate limit), the
+        checkpoint is kept and the next fetch continues below the oldest tweet
+        fetched so far, until the gap is closed. The new checkpoint is only staged;
+        call `save_checkpoint` once the returned tweets are queued.
+        """
+        checkpoint = self.checkpoints.get(source, {})
+        since_id = checkpoint.get("since_id")
+        # While catching up: the oldest tweet fetched so far, and the newest one,
+        # which becomes the checkpoint once the gap is closed
+        until_id = checkpoint.get("until_id")
+        newest_id = checkpoint.get("newest_id")
+        tweets: List[Dict[str, Any]] = []
+        pagination_token = None
+        complete = False
+
+        for _ in range(POLL_MAX_PAGES):
+            try:
+                raw = self._fetch_page(source, since_id, until_id, pagination_token)
+            except tweepy.TooManyRequests as e:
+                # The client recorded the headers; make sure the window reads as used
+                # up even if they were missing
+                reset = e.response.headers.get("x-rate-limit-reset")
+                self.twitter_api.rate_limits.exhausted(
+                    self._endpoint(source), float(reset) if reset else None
+                )
+                break
+
+            response = self.twitter_api.parse_raw_response(raw)
+            page = self.twitter_api._format_tweets(response)
+            self.twitter_api.analytics.ingest(page)
+            tweets.extend(page)
+            # Results are newest first, so the first page holds the newest ID
+            newest_id = newest_id or response.meta.get("newest_id")
+
+            pagination_token = response.meta.get("next_token")
+            # Without a checkpoint, the newest page is enough to start one
+            if not pagination_token or since_id is None:
+                complete = True
+                break
+
+        if complete:
+            staged = {"since_id": newest_id or since_id}
+        elif tweets:
+            staged = {
+                "since_id": since_id,
+                "until_id": str(min((tweet["id"] for tweet in tweets), key=int)),
+                "newest_id": newest_id,
+            }
+        else:
+            staged = checkpoint
+        self._staged[source] = {key: value for key, value in staged.items() if value}
+
+        # Without a checkpoint, only establish one unless asked to backfill
+        if since_id is None and not self.backfill:
+            return []
+        return sorted(tweets, key=lambda tweet: int(tweet["id"]))
+
+    def save_checkpoint(self, source: str) -> None:
+        """Persist the checkpoint staged by the source's last `fetch_new`"""
+        staged = self._staged.pop(source, None)
+        if staged is None or staged == self.checkpoints.get(source, {}):
+            return
+        self.checkpoints[source] = staged
+        write_json_file(self.checkpoint_file, self.checkpoints)
+
+    def next_interval(self, source: str, interval: float, new_count: int) -> float:
+        """Adapt the poll interval to observed activity and rate-limit headroom"""
+        if new_count:
+            interval = max(self.min_interval, interval / 2)
+        else:
+            interval = min(self.max_interval, interval * 1.5)
+        endpoint = self._endpoint(source)
+        if endpoint is None:
+            return interval
+        return max(interval, self.twitter_api.rate_limits.min_interval(endpoint))
+
+    async def _poll_source(self, source: str, stop_event: asyncio.Event) -> None:
+        interval = self.min_interval
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                tweets = await asyncio.to_thread(self.fetch_new, source)
+            except Exception as e:
+                print(f"Warning: polling '{source}' failed: {e}")
+                tweets = []
+
+            accepted = (
+                self.triage.filter(tweets, direct=source == "mentions")
+                if self.triage
+                else tweets
+            )
+            jobs = [PollJob(source=source, tweet=tweet) for tweet in accepted]
+            for i in range(0, len(jobs), self.batch_size):
+                await self._queue.put(jobs[i : i + self.batch_size])
+            # Only move past the tweets once they are queued
+            self.save_checkpoint(source)
+
+            interval = self.next_interval(source, interval, len(tweets))
+            delay = max(0.0, interval - (time.monotonic() - started))
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self.handler(batch)
+            except Exception as e:
+                print(f"Warning: job from '{batch[0].source}' failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """Poll all sources until `stop_event` is set, then drain queued jobs"""
+        stop_event = stop_event or asyncio.Event()
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(
+                *(self._poll_source(source, stop_event) for source in self.sources)
+            )
+            await self._queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
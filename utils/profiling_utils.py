@@ -0,0 +1,388 @@
+import os
+import sys
+import json
+import time
+import atexit
+import bisect
+import random
+import inspect
+import cProfile
+import functools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable
+
+from utils.common_utils import (
+    get_data_path,
+    read_json_file,
+    write_json_file,
+    file_lock,
+)
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+
+# Histogram bucket upper bounds; the last bucket is open ended
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+SIZE_BUCKETS_BYTES = [64, 256, 1024, 4096, 16384, 65536, 262144]
+
+# Fraction of tool calls run under a profiler, and the wall time above which the
+# captured profile is kept
+PROFILE_SAMPLE_RATE = float(os.getenv("TWITTER_AGENT_PROFILE_SAMPLE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("TWITTER_AGENT_PROFILE_SLOW_MS", "2000"))
+
+# Seconds spent waiting on upstream APIs during the current tool call
+_api_seconds: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "api_seconds", default=None
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram that can be merged and serialized"""
+
+    def __init__(self, bounds: List[float], counts: Optional[List[int]] = None):
+        self.bounds = bounds
+        self.counts = counts or [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": self.counts, "total": self.total, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, bounds: List[float], data: Dict[str, Any]) -> "Histogram":
+        histogram = cls(bounds, list(data["counts"]))
+        histogram.total = data["total"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class ToolStats:
+    """Aggregated measurements of a single tool"""
+
+    _HISTOGRAMS = {
+        "wall_ms": LATENCY_BUCKETS_MS,
+        "api_ms": LATENCY_BUCKETS_MS,
+        "overhead_ms": LATENCY_BUCKETS_MS,
+        "input_bytes": SIZE_BUCKETS_BYTES,
+        "output_bytes": SIZE_BUCKETS_BYTES,
+    }
+
+    def __init__(self):
+        self.histograms = {
+            name: Histogram(bounds) for name, bounds in self._HISTOGRAMS.items()
+        }
+        self.errors: Counter = Counter()
+
+    def merge(self, other: "ToolStats") -> None:
+        for name, histogram in other.histograms.items():
+            self.histograms[name].merge(histogram)
+        self.errors.update(other.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "histograms": {
+                name: histogram.to_dict() for name, histogram in self.histograms.items()
+            },
+            "errors": dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolStats":
+        stats = cls()
+        for name, histogram in data["histograms"].items():
+            stats.histograms[name] = Histogram.from_dict(cls._HISTOGRAMS[name], histogram)
+        stats.errors.update(data["errors"])
+        return stats
+
+
+_stats: Dict[str, ToolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats_file() -> str:
+    return get_data_path("tool_profile.json")
+
+
+@contextmanager
+def api_timer():
+    """Attribute the time spent in the block to upstream API latency"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        accumulator = _api_seconds.get()
+        if accumulator is not None:
+            accumulator[0] += time.perf_counter() - started
+
+
+class InstrumentedClient:
+    """Proxy that times every method call of an API client as upstream latency"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def timed(*args, **kwargs):
+            with api_timer():
+                return attribute(*args, **kwargs)
+
+        return timed
+
+
+def submit_in_context(executor, fn: Callable, *args):
+    """Submit to a thread pool so API time in the worker counts towards the current tool"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _payload_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    try:
+        return len(json.dumps(value, default=str).encode())
+    except (TypeError, ValueError):
+        return len(str(value).encode())
+
+
+def _record(
+    name: str,
+    wall: float,
+    api: float,
+    arguments: Dict[str, Any],
+    result: Any,
+    error: Optional[str],
+) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(name, ToolStats())
+        stats.histograms["wall_ms"].add(wall * 1000)
+        stats.histograms["api_ms"].add(api * 1000)
+        stats.histograms["overhead_ms"].add(max(0.0, wall - api) * 1000)
+        stats.histograms["input_bytes"].add(_payload_size(arguments))
+        stats.histograms["output_bytes"].add(_payload_size(result))
+        if error:
+            stats.errors[error] += 1
+
+
+def _error_class(result: Any) -> Optional[str]:
+    """Error class of a failed ToolResponse"""
+    if getattr(result, "success", True) is False:
+        return getattr(result, "error_type", None) or "ToolError"
+    return None
+
+
+# Held while a sampled call is profiled. Only one profiler can be active per
+# process, so calls sampled while it is taken (e.g. concurrent async tools) skip it.
+_profiler_lock = threading.Lock()
+
+
+def _start_profiler():
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    try:
+        if PyinstrumentProfiler is not None:
+            profiler = PyinstrumentProfiler(async_mode="enabled")
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    except Exception:
+        _profiler_lock.release()
+        raise
+
+
+def _stop_profiler(profiler, name: str, wall: float) -> None:
+    if profiler is None:
+        return
+    try:
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+        else:
+            profiler.stop()
+    finally:
+        _profiler_lock.release()
+    if wall * 1000 < PROFILE_SLOW_MS:
+        return
+
+    base = get_data_path("profiles", f"{name}-{int(time.time() * 1000)}")
+    if isinstance(profiler, cProfile.Profile):
+        profiler.dump_stats(f"{base}.prof")
+    else:
+        with open(f"{base}.html", "w") as file:
+            file.write(profiler.output_html())
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Record wall time, upstream API time, local overhead, payload sizes and error
+    classes of every call. Apply it below `@function_tool`:
+
+        @function_tool
+        @profiled
+        def my_tool(...): ...
+
+    A sample of calls (`TWITTER_AGENT_PROFILE_SAMPLE`) also runs under a profiler.
+    When a sampled call is slower than `TWITTER_AGENT_PROFILE_SLOW_MS`, its profile
+    is saved to the data directory (pyinstrument if installed, else cProfile).
+    """
+    name = func.__name__
+
+    def _arguments(args, kwargs) -> Dict[str, Any]:
+        # Skip the run context, which isn't part of the payload
+        if args and hasattr(args[0], "context"):
+            args = args[1:]
+        return {"args": args, **kwargs} if args else kwargs
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            accumulator = [0.0]
+            token = _api_seconds.set(accumulator)
+            profiler = None
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                profiler = _start_profiler()
+                result = await func(*args, **kwargs)
+                error = _error_class(result)
+                return result
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                wall = time.perf_counter() - started
+                _stop_profiler(profiler, name, wall)
+                _api_seconds.reset(token)
+                _record(name, wall, accumulator[0], _arguments(args, kwargs), result, error)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        accumulator = [0.0]
+        token = _api_seconds.set(accumulator)
+        profiler = None
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            profiler = _start_profiler()
+            result = func(*args, **kwargs)
+            error = _error_class(result)
+            return result
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            wall = time.perf_counter() - started
+            _stop_profiler(profiler, name, wall)
+            _api_seconds.reset(token)
+            _record(name, wall, accumulator[0], _arguments(args, kwargs), result, error)
+
+    return wrapper
+
+
+def flush_stats() -> None:
+    """Merge this process's measurements into the stats file"""
+    with _stats_lock:
+        if not _stats:
+            return
+        # Worker processes flush into the same file
+        with file_lock(_stats_file()):
+            stored = {
+                name: ToolStats.from_dict(data)
+                for name, data in read_json_file(_stats_file(), {}).items()
+            }
+            for name, stats in _stats.items():
+                stored.setdefault(name, ToolStats()).merge(stats)
+            write_json_file(
+                _stats_file(), {name: stats.to_dict() for name, stats in stored.items()}
+            )
+        _stats.clear()
+
+
+atexit.register(flush_stats)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def profile_report() -> str:
+    """Render the recorded tool measurements as a table"""
+    flush_stats()
+    stored = read_json_file(_stats_file(), {})
+    if not stored:
+        return "No tool calls recorded yet."
+
+    lines = [
+        f"{'tool':<24} {'calls':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'api p50':>8} {'local p50':>9} {'avg out B':>9}  top errors"
+    ]
+    rows = sorted(
+        ((name, ToolStats.from_dict(data)) for name, data in stored.items()),
+        key=lambda row: -row[1].histograms["wall_ms"].total,
+    )
+    for name, stats in rows:
+        wall = stats.histograms["wall_ms"]
+        output = stats.histograms["output_bytes"]
+        top_errors = ", ".join(
+            f"{error} x{count}" for error, count in stats.errors.most_common(3)
+        )
+        lines.append(
+            f"{name:<24} {wall.count:>6} {sum(stats.errors.values()):>6} "
+            f"{_fmt(wall.percentile(0.5)):>8} {_fmt(wall.percentile(0.95)):>8} "
+            f"{_fmt(stats.histograms['api_ms'].percentile(0.5)):>8} "
+            f"{_fmt(stats.histograms['overhead_ms'].percentile(0.5)):>9} "
+            f"{_fmt(output.total / output.count if output.count else None):>9}  "
+            f"{top_errors}"
+        )
+    lines.append(
+        "Percentiles are histogram bucket upper bounds. API time is summed across "
+        "concurrent requests."
+    )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if "--reset" in sys.argv:
+        write_json_file(_stats_file(), {})
+    print(profile_report())
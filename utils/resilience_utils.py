@@ -0,0 +1,347 @@
+import os
+import math
+import time
+import socket
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Union
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from requests.adapters import HTTPAdapter
+from agents import Model
+
+from utils.profiling_utils import api_timer
+
+
+# Consecutive upstream failures that open a circuit, and how long it stays open
+# before a single trial call is let through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Per-HTTP-request (connect, read) timeouts for Twitter. They don't cover the
+# waits tweepy does on rate limits, which happen between requests.
+TWITTER_TIMEOUT = (
+    float(os.getenv("TWITTER_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("TWITTER_READ_TIMEOUT", "30")),
+)
+
+# Time budget of a single model call
+MODEL_TIMEOUT = float(os.getenv("MODEL_TIMEOUT", "120"))
+
+# Hedged reads send a second identical request when the first is slower than the
+# endpoint's p95, trading extra requests (and rate-limit budget) for tail latency
+HEDGE_READS = os.getenv("TWITTER_AGENT_HEDGE_READS", "0") == "1"
+HEDGED_METHODS = {
+    "get_tweet",
+    "get_tweets",
+    "get_user",
+    "get_users",
+    "get_users_tweets",
+    "search_recent_tweets",
+}
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.2
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit is open"""
+
+    def __init__(self, name: str, failures: int, retry_after: float):
+        super().__init__(
+            f"{name} is failing ({failures} consecutive errors); not calling it "
+            f"again for {retry_after:.0f}s"
+        )
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(e: Exception) -> bool:
+    """Whether an error means the backend is unhealthy, rather than a bad request.
+
+    Timeouts, connection errors and 5xx responses count. 4xx responses don't; rate
+    limits (429) are handled by tweepy's waits and the rate-limit tracker. Neither
+    do other OS errors (e.g. a missing file), which say nothing about the backend.
+    """
+    network_errors = (
+        ConnectionError,
+        TimeoutError,
+        socket.timeout,
+        asyncio.TimeoutError,
+        RequestsConnectionError,
+        Timeout,
+    )
+    if isinstance(e, network_errors):
+        return True
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if status is None:
+        # Transport errors wrapped by client libraries, e.g. openai's
+        # APIConnectionError/APITimeoutError or tweepy's "Failed to send request"
+        return (
+            "Timeout" in type(e).__name__
+            or "Connection" in type(e).__name__
+            or str(e).startswith("Failed to send request")
+        )
+    return status >= 500
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Raise `CircuitOpenError` unless a call may go through now.
+
+        Returns:
+            bool: Whether the call is the half-open trial. Its caller must record its
+                outcome, or call `release_trial` if it ends without one.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            retry_after = self.opened_at + self.reset_seconds - time.monotonic()
+            if retry_after > 0 or self._trial_in_flight:
+                raise CircuitOpenError(self.name, self.failures, max(retry_after, 0))
+            # Half-open: let one trial call through
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        """Let another trial through after one ended without an outcome (e.g. cancelled)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self, trial: bool = False) -> None:
+        with self._lock:
+            # Calls that started before the circuit opened don't close it; only the
+            # trial call does
+            if self.opened_at is not None and not trial:
+                return
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, trial: bool = False) -> None:
+        with self._lock:
+            self.failures += 1
+            if trial:
+                self._trial_in_flight = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def record(self, e: Exception, trial: bool = False) -> None:
+        """Record a failed call; only upstream failures count towards opening"""
+        if is_upstream_failure(e):
+            self.record_failure(trial)
+        else:
+            self.record_success(trial)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an endpoint or model"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Applies a default timeout to every request of a `requests` session"""
+
+    def __init__(self, timeout, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class LatencyWindow:
+    """Recent successful call latencies of an endpoint"""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        # Nearest-rank percentile
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)]
+
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+class ResilientClient:
+    """
+    Proxy around a tweepy client that adds per-endpoint circuit breakers,
+    per-request timeouts and (if enabled) hedged reads.
+    """
+
+    def __init__(
+        self, client, timeout=TWITTER_TIMEOUT, hedge_reads: bool = HEDGE_READS
+    ):
+        self._client = client
+        self._hedge_reads = hedge_reads
+        self._latencies: Dict[str, LatencyWindow] = {}
+        adapter = TimeoutHTTPAdapter(timeout)
+        client.session.mount("https://", adapter)
+        client.session.mount("http://", adapter)
+        # tweepy.API (v1.1 and media uploads) passes its own timeout to every
+        # request, which takes precedence over the adapter's
+        if hasattr(client, "timeout"):
+            client.timeout = timeout
+
+    def _call(self, name: str, method, *args, **kwargs):
+        breaker = get_breaker(f"Twitter {name}")
+        trial = breaker.before_call()
+        started = time.monotonic()
+        try:
+            if self._hedge_reads and name in HEDGED_METHODS:
+                result = self._hedged(name, method, *args, **kwargs)
+            else:
+                result = method(*args, **kwargs)
+        except Exception as e:
+            breaker.record(e, trial)
+            raise
+        except BaseException:
+            if trial:
+                breaker.release_trial()
+            raise
+        breaker.record_success(trial)
+        latency = time.monotonic() - started
+        self._latencies.setdefault(name, LatencyWindow()).add(latency)
+        return result
+
+    def _hedged(self, name: str, method, *args, **kwargs):
+        p95 = self._latencies.setdefault(name, LatencyWindow()).p95()
+        if p95 is None:
+            return method(*args, **kwargs)
+
+        futures = {_hedge_executor.submit(method, *args, **kwargs)}
+        done, _ = wait(futures, timeout=max(p95, HEDGE_MIN_DELAY))
+        if not done:
+            futures.add(_hedge_executor.submit(method, *args, **kwargs))
+
+        error = None
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+
+        def call(*args, **kwargs):
+            return self._call(name, attribute, *args, **kwargs)
+
+        # Keep the method's name and attributes; tweepy's paginators inspect them
+        call.__name__ = attribute.__name__
+        call.__dict__.update(getattr(attribute, "__dict__", {}))
+        return call
+
+
+class ResilientModel(Model):
+    """
+    Model wrapper with a circuit breaker and a time budget per call. Time spent
+    waiting on the model counts as API time in tool profiles (e.g. for tools that
+    run a nested agent).
+
+    The wrapped model is resolved on first use, so agents can be created (e.g. for
+    offline replays) without any model credentials.
+    """
+
+    def __init__(self, model: Union[str, Model], timeout: float = MODEL_TIMEOUT):
+        self._model = model
+        self.timeout = timeout
+        # One breaker per model ID, so a failing model doesn't trip the others
+        # served by the same class (e.g. every LiteLLM model)
+        self.name = (
+            model
+            if isinstance(model, str)
+            else getattr(model, "model", None) or type(model).__name__
+        )
+        self._breaker = get_breaker(f"Model {self.name}")
+
+    def _inner(self) -> Model:
+        if isinstance(self._model, str):
+            from agents import OpenAIProvider
+
+            self._model = OpenAIProvider().get_model(self._model)
+        return self._model
+
+    async def get_response(self, *args, **kwargs):
+        trial = self._breaker.before_call()
+        try:
+            with api_timer():
+                response = await asyncio.wait_for(
+                    self._inner().get_response(*args, **kwargs), self.timeout
+                )
+        except Exception as e:
+            self._breaker.record(e, trial)
+            raise
+        except BaseException:
+            # Cancelled: says nothing about the backend
+            if trial:
+                self._breaker.release_trial()
+            raise
+        self._breaker.record_success(trial)
+        return response
+
+    async def stream_response(self, *args, **kwargs):
+        trial = self._breaker.before_call()
+        outcome = False
+        try:
+            # Streams are long-lived; the budget applies to the wait for each event
+            stream = self._inner().stream_response(*args, **kwargs).__aiter__()
+            while True:
+                try:
+                    with api_timer():
+                        event = await asyncio.wait_for(
+                            stream.__anext__(), self.timeout
+                        )
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    outcome = True
+                    self._breaker.record(e, trial)
+                    raise
+                yield event
+            outcome = True
+            self._breaker.record_success(trial)
+        finally:
+            # Cancelled, or closed early by the consumer (GeneratorExit)
+            if trial and not outcome:
+                self._breaker.release_trial()
@@ -0,0 +1,143 @@
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+
+# Default max characters of a tool result sent to the model
+DEFAULT_OUTPUT_BUDGET = 4000
+
+# Compact output can be switched off to see the full payloads while debugging
+COMPACT_OUTPUT = os.getenv("TWITTER_AGENT_COMPACT_OUTPUT", "1") != "0"
+
+# Shorter names for the tweet metrics, which repeat on every tweet
+METRIC_KEYS = {
+    "like_count": "likes",
+    "retweet_count": "retweets",
+    "reply_count": "replies",
+    "quote_count": "quotes",
+    "bookmark_count": "bookmarks",
+    "impression_count": "views",
+}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _compact_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {METRIC_KEYS.get(key, key): value for key, value in metrics.items() if value}
+
+
+def compact_value(value: Any) -> Any:
+    """Recursively drop empty fields, zero metrics and encode lists of dicts as tables"""
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            item = (
+                _compact_metrics(item)
+                if key == "public_metrics" and isinstance(item, dict)
+                else compact_value(item)
+            )
+            if not _is_empty(item):
+                compacted[key] = item
+        return compacted
+    if isinstance(value, list):
+        items = [compact_value(item) for item in value]
+        if len(items) > 1 and all(isinstance(item, dict) for item in items):
+            return to_table(items)
+        return items
+    return value
+
+
+def to_table(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Encode records as shared `columns` plus one value `rows` entry per record"""
+    columns: List[str] = []
+    for record in records:
+        columns.extend(key for key in record if key not in columns)
+    return {
+        "columns": columns,
+        "rows": [[record.get(column) for column in columns] for record in records],
+    }
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _is_table(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {"columns", "rows"}
+
+
+def _longest_records(value: Any) -> Optional[List[Any]]:
+    """
+    The longest list of records nested anywhere in the value: a table's `rows`
+    or a plain list. A table's `columns` and its individual rows are never
+    returned, so trimming the result only ever drops whole records.
+    """
+    candidates: List[List[Any]] = []
+    if _is_table(value):
+        candidates.append(value["rows"])
+        # Cells may hold lists or tables of their own
+        children = [cell for row in value["rows"] for cell in row]
+    elif isinstance(value, dict):
+        children = list(value.values())
+    elif isinstance(value, list):
+        candidates.append(value)
+        children = value
+    else:
+        return None
+
+    for child in children:
+        candidate = _longest_records(child)
+        if candidate is not None:
+            candidates.append(candidate)
+    candidates = [items for items in candidates if len(items) > 1]
+    return max(candidates, key=len, default=None)
+
+
+def compact_dumps(payload: Dict[str, Any], budget: int = DEFAULT_OUTPUT_BUDGET) -> str:
+    """
+    Serialize a tool payload compactly for the model context.
+
+    Empty values and top-level volatile `*_at` timestamps are elided, lists of
+    records become tables, and the result is kept within `budget` characters by
+    dropping trailing records, i.e. whole table rows or list items (noted in a
+    `truncated` field).
+
+    Args:
+        payload (Dict[str, Any]): The dumped `ToolResponse`.
+        budget (int): Max characters of the result.
+
+    Returns:
+        str: Compact JSON, or a cut string ending in a truncation marker if even a
+            single record per list exceeds the budget.
+    """
+    data = payload.get("data")
+    if isinstance(data, dict):
+        payload = {
+            **payload,
+            "data": {key: value for key, value in data.items() if not key.endswith("_at")},
+        }
+    compacted = compact_value(payload)
+
+    text = _dumps(compacted)
+    if len(text) <= budget:
+        return text
+
+    dropped = 0
+    while len(text) > budget:
+        items = _longest_records(compacted)
+        if items is None:
+            break
+        # Drop a proportional share at once rather than re-encoding per item
+        excess = max(1, len(items) * (len(text) - budget) // len(text))
+        removed = min(excess, len(items) - 1)
+        del items[-removed:]
+        dropped += removed
+        compacted["truncated"] = f"{dropped} records omitted to fit the output budget"
+        text = _dumps(compacted)
+
+    if len(text) > budget:
+        marker = f"...[truncated {len(text) - budget} chars]"
+        text = text[: max(0, budget - len(marker))] + marker
+    return text
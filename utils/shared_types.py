@@ -1,5 +1,7 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+from utils.serialization_utils import COMPACT_OUTPUT, DEFAULT_OUTPUT_BUDGET, compact_dumps
 
 
 class ToolResponse(BaseModel):
@@ -10,8 +12,34 @@ class ToolResponse(BaseModel):
         success (bool): Whether the operation was successful.
         data (Optional[dict]): Function-specific data payload if successful.
         error (Optional[str]): Error message if the operation failed.
+
+    `str()` of a response is what the model sees as the tool output, so it renders
+    compact JSON within the response's output budget (see `compact_dumps`).
     """
 
     success: bool
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    # Exception class behind a failure, kept for profiling but never sent to the model
+    _error_type: Optional[str] = PrivateAttr(default=None)
+    _output_budget: int = PrivateAttr(default=DEFAULT_OUTPUT_BUDGET)
+
+    @classmethod
+    def from_exception(cls, e: Exception) -> "ToolResponse":
+        response = cls(success=False, error=str(e))
+        response._error_type = type(e).__name__
+        return response
+
+    @property
+    def error_type(self) -> Optional[str]:
+        return self._error_type
+
+    def with_budget(self, budget: int) -> "ToolResponse":
+        """Set the max characters of the model-facing output"""
+        self._output_budget = budget
+        return self
+
+    def __str__(self) -> str:
+        if not COMPACT_OUTPUT:
+            return self.model_dump_json()
+        return compact_dumps(self.model_dump(), self._output_budget)
@@ -0,0 +1,240 @@
+import sys
+import json
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional, Dict, Any, List, Literal, AsyncIterator
+
+from openai.types.responses import ResponseTextDeltaEvent
+
+
+StreamRecord = Dict[str, Any]
+OverflowPolicy = Literal["block", "drop_oldest"]
+
+
+def event_to_record(event, run_id: Optional[str] = None) -> Optional[StreamRecord]:
+    """Convert an Agents SDK stream event into a plain, JSON-serializable record.
+
+    Returns None for events that carry nothing worth publishing.
+    """
+    record: Optional[StreamRecord] = None
+
+    if event.type == "raw_response_event":
+        if isinstance(event.data, ResponseTextDeltaEvent):
+            record = {"type": "text_delta", "delta": event.data.delta}
+    elif event.type == "agent_updated_stream_event":
+        record = {"type": "agent_updated", "agent": event.new_agent.name}
+    elif event.type == "run_item_stream_event":
+        item = event.item
+        if item.type == "tool_call_item":
+            record = {
+                "type": "tool_called",
+                "tool": item.raw_item.name,
+                "arguments": item.raw_item.arguments,
+            }
+        elif item.type == "tool_call_output_item":
+            record = {"type": "tool_output", "output": str(item.output)}
+        elif item.type == "message_output_item":
+            record = {"type": "message_output"}
+
+    if record is not None:
+        record["ts"] = time.time()
+        if run_id:
+            record["run_id"] = run_id
+    return record
+
+
+class EventSink(ABC):
+    """Base class for stream event destinations.
+
+    Sinks receive records in batches. `overflow` decides what happens when the sink
+    falls behind: "block" slows the producer down, "drop_oldest" discards old records.
+    """
+
+    overflow: OverflowPolicy = "block"
+
+    @abstractmethod
+    async def write(self, records: List[StreamRecord]) -> None:
+        """Deliver a batch of records, oldest first"""
+
+    async def close(self) -> None:
+        pass
+
+
+class StdoutSink(EventSink):
+    """Human-readable console output, written off the event loop"""
+
+    def __init__(self, show_text: bool = False, show_tool_output: bool = False):
+        self.show_text = show_text
+        self.show_tool_output = show_tool_output
+
+    def _format(self, record: StreamRecord) -> str:
+        record_type = record["type"]
+        if record_type == "text_delta":
+            return record["delta"] if self.show_text else ""
+        if record_type == "agent_updated":
+            return f"-- Agent Updated.\n{record['agent']}\n"
+        if record_type == "tool_called":
+            return (
+                "-- Tool Called.\n"
+                f"Tool name: {record['tool']}\n"
+                f"Arguments: {record['arguments']}\n"
+            )
+        if record_type == "tool_output" and self.show_tool_output:
+            return f"-- Tool Output:\n{record['output']}\n"
+        return ""
+
+    def _write_text(self, text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    async def write(self, records: List[StreamRecord]) -> None:
+        text = "".join(self._format(record) for record in records)
+        if text:
+            await asyncio.to_thread(self._write_text, text)
+
+
+class JsonLinesSink(EventSink):
+    """Appends every record as one JSON line to a file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, "a")
+
+    def _write_lines(self, lines: str) -> None:
+        self._file.write(lines)
+        self._file.flush()
+
+    async def write(self, records: List[StreamRecord]) -> None:
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        await asyncio.to_thread(self._write_lines, lines)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._file.close)
+
+
+class RingBufferSink(EventSink):
+    """Keeps the most recent records in memory, e.g. for a status endpoint"""
+
+    overflow: OverflowPolicy = "drop_oldest"
+
+    def __init__(self, capacity: int = 1000):
+        self.records: deque = deque(maxlen=capacity)
+
+    async def write(self, records: List[StreamRecord]) -> None:
+        self.records.extend(records)
+
+    def snapshot(self) -> List[StreamRecord]:
+        return list(self.records)
+
+
+class BroadcastSink(EventSink):
+    """
+    Fans records out to any number of subscribers, such as websocket or SSE handlers.
+
+    Each subscriber has its own bounded queue; a slow subscriber loses its oldest
+    records instead of stalling the run or the other subscribers.
+    """
+
+    overflow: OverflowPolicy = "drop_oldest"
+
+    def __init__(self, subscriber_buffer: int = 1000):
+        self.subscriber_buffer = subscriber_buffer
+        self._subscribers: List[asyncio.Queue] = []
+
+    async def write(self, records: List[StreamRecord]) -> None:
+        for queue in self._subscribers:
+            for record in records:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(record)
+
+    async def close(self) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def subscribe(self) -> AsyncIterator[StreamRecord]:
+        """Yield records until the sink is closed"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_buffer)
+        self._subscribers.append(queue)
+        try:
+            while (record := await queue.get()) is not None:
+                yield record
+        finally:
+            self._subscribers.remove(queue)
+
+    async def subscribe_sse(self) -> AsyncIterator[str]:
+        """Yield records formatted as Server-Sent Events"""
+        async for record in self.subscribe():
+            yield f"event: {record['type']}\ndata: {json.dumps(record, default=str)}\n\n"
+
+
+class EventPipeline:
+    """
+    Delivers stream records to several sinks without blocking the event loop.
+
+    Every sink gets its own bounded buffer drained by a background task, which
+    batches whatever has accumulated into a single `write` call. Publishing only
+    waits when a "block" sink's buffer is full.
+    """
+
+    def __init__(self, sinks: List[EventSink], buffer_size: int = 1000):
+        self.sinks = sinks
+        self._queues = [asyncio.Queue(maxsize=buffer_size) for _ in sinks]
+        self._tasks: List[asyncio.Task] = []
+        self._closed = False
+
+    def _start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._drain(sink, queue))
+                for sink, queue in zip(self.sinks, self._queues)
+            ]
+
+    async def _drain(self, sink: EventSink, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            records = [record for record in batch if record is not None]
+            try:
+                if records:
+                    await sink.write(records)
+            except Exception as e:
+                print(f"Warning: stream sink {type(sink).__name__} failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+            if len(records) < len(batch):
+                return
+
+    async def publish(self, record: StreamRecord) -> None:
+        """
+        Queue a record for every sink.
+
+        Raises:
+            RuntimeError: If the pipeline was closed; nothing drains its buffers.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot publish to a closed event pipeline")
+        self._start()
+        for sink, queue in zip(self.sinks, self._queues):
+            if sink.overflow == "drop_oldest" and queue.full():
+                queue.get_nowait()
+                queue.task_done()
+            await queue.put(record)
+
+    async def close(self) -> None:
+        """Flush all buffered records and close the sinks"""
+        if self._closed:
+            return
+        self._closed = True
+        self._start()
+        for queue in self._queues:
+            await queue.put(None)
+        await asyncio.gather(*self._tasks)
+        for sink in self.sinks:
+            await sink.close()
@@ -0,0 +1,257 @@
+import json
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
+
+from pydantic import TypeAdapter
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputItem,
+)
+from agents import (
+    Agent,
+    FunctionTool,
+    Model,
+    ModelResponse,
+    RunConfig,
+    RunContextWrapper,
+    RunHooks,
+    Runner,
+    Usage,
+)
+
+from utils.agent_utils import AgentContext
+from utils.common_utils import get_data_path, file_lock
+
+
+def _runs_file() -> str:
+    return get_data_path("runs.jsonl")
+
+
+class RunRecorder(RunHooks):
+    """
+    Records a run's input, model responses, tool calls and timings.
+
+    Pass it as `hooks=` to `Runner.run`/`Runner.run_streamed`, then call `save(result)`
+    once the run is complete to append the trace to the run store.
+    """
+
+    def __init__(self, request: str, character_file: str, agent_name: str):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.request = request
+        self.character_file = character_file
+        self.agent_name = agent_name
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        # Keyed by call ID, so concurrent calls of the same tool don't mix up
+        self._tool_starts: Dict[str, float] = {}
+        self._tool_durations: Dict[str, float] = {}
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        call_id = getattr(context, "tool_call_id", None)
+        if call_id:
+            self._tool_starts[call_id] = time.perf_counter()
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        started = self._tool_starts.pop(getattr(context, "tool_call_id", None), None)
+        if started is not None:
+            self._tool_durations[context.tool_call_id] = time.perf_counter() - started
+
+    def build(self, result) -> Dict[str, Any]:
+        """Build the trace of a finished run from its result"""
+        calls: Dict[str, Dict[str, Any]] = {}
+
+        for item in result.new_items:
+            if item.type == "tool_call_item":
+                raw = item.raw_item
+                calls[raw.call_id] = {
+                    "call_id": raw.call_id,
+                    "tool": raw.name,
+                    "arguments": raw.arguments,
+                    "output": None,
+                    "duration": self._tool_durations.get(raw.call_id),
+                }
+            elif item.type == "tool_call_output_item":
+                call_id = item.raw_item["call_id"]
+                if call_id in calls:
+                    # The exact text the model saw, not the tool's return object
+                    calls[call_id]["output"] = item.raw_item["output"]
+
+        final_output = result.final_output
+        usage = result.context_wrapper.usage
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "agent": self.agent_name,
+            "character_file": self.character_file,
+            "input": self.request,
+            "model_responses": [
+                [output.model_dump(exclude_none=True) for output in response.output]
+                for response in result.raw_responses
+            ],
+            "tool_calls": list(calls.values()),
+            "final_output": (
+                final_output.model_dump()
+                if hasattr(final_output, "model_dump")
+                else final_output
+            ),
+            "usage": {
+                "requests": usage.requests,
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+            },
+            "duration": time.perf_counter() - self.started,
+        }
+
+    def save(self, result) -> Dict[str, Any]:
+        """Append the trace to the run store and return it"""
+        trace = self.build(result)
+        line = json.dumps(trace, default=str, separators=(",", ":")) + "\n"
+        with file_lock(_runs_file()), open(_runs_file(), "a") as file:
+            file.write(line)
+        return trace
+
+
+def load_runs() -> List[Dict[str, Any]]:
+    """Return every recorded run, oldest first"""
+    runs = []
+    try:
+        with open(_runs_file(), "r") as file:
+            for line in file:
+                if line.strip():
+                    runs.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return runs
+
+
+def load_run(run_id: str) -> Dict[str, Any]:
+    """Return a recorded run by ID, or the most recent one for "last"."""
+    runs = load_runs()
+    if run_id == "last" and runs:
+        return runs[-1]
+    for run in runs:
+        if run["run_id"] == run_id:
+            return run
+    raise LookupError(f"Run '{run_id}' not found")
+
+
+_output_item_adapter = TypeAdapter(ResponseOutputItem)
+
+
+class ReplayModel(Model):
+    """Model that returns the recorded responses of a run, in order, without any network"""
+
+    def __init__(self, model_responses: List[List[Dict[str, Any]]]):
+        self._responses = deque(model_responses)
+
+    def _next_output(self) -> List[ResponseOutputItem]:
+        if not self._responses:
+            raise RuntimeError("Replay diverged: no recorded model responses left")
+        return [
+            _output_item_adapter.validate_python(item)
+            for item in self._responses.popleft()
+        ]
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        return ModelResponse(
+            output=self._next_output(), usage=Usage(), response_id=None
+        )
+
+    async def stream_response(self, *args, **kwargs):
+        """Emit the next recorded response as a single `response.completed` event.
+
+        Text deltas weren't recorded, so streamed replays carry none.
+        """
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            sequence_number=0,
+            response=Response(
+                id="replay",
+                created_at=time.time(),
+                model="replay",
+                object="response",
+                output=self._next_output(),
+                tool_choice="auto",
+                tools=[],
+                parallel_tool_calls=False,
+            ),
+        )
+
+
+def _replay_tool(
+    tool: FunctionTool, recorded: Dict[str, Dict[str, Any]], mismatches: List[str]
+) -> FunctionTool:
+    async def on_invoke_tool(context: RunContextWrapper[Any], arguments: str) -> str:
+        # Replayed model responses carry the recorded call IDs, so every call gets
+        # its own recorded output even when several run concurrently
+        call_id: Optional[str] = getattr(context, "tool_call_id", None)
+        call = recorded.get(call_id)
+        if call is None or call["tool"] != tool.name:
+            raise RuntimeError(
+                f"Replay diverged: unexpected call to {tool.name} ({call_id})"
+            )
+        del recorded[call_id]
+        if json.loads(arguments or "{}") != json.loads(call["arguments"] or "{}"):
+            mismatches.append(f"{tool.name}: arguments differ from recording")
+        return call["output"]
+
+    return FunctionTool(
+        name=tool.name,
+        description=tool.description,
+        params_json_schema=tool.params_json_schema,
+        on_invoke_tool=on_invoke_tool,
+        strict_json_schema=tool.strict_json_schema,
+    )
+
+
+async def replay_run(trace: Dict[str, Any], agent: Agent) -> Dict[str, Any]:
+    """
+    Re-execute a recorded run offline: the model returns the recorded responses and
+    every tool returns its recorded output.
+
+    Args:
+        trace (Dict[str, Any]): A run loaded with `load_run`.
+        agent (Agent): A freshly created agent of the same kind as the recorded one.
+
+    Returns:
+        Dict[str, Any]: `final_output`, whether it `matches` the recording,
+            any `mismatches`, and the recorded and replayed durations.
+    """
+    recorded_calls = {call["call_id"]: call for call in trace["tool_calls"]}
+
+    mismatches: List[str] = []
+    replay_agent = agent.clone(
+        model=ReplayModel(trace["model_responses"]),
+        tools=[
+            _replay_tool(tool, recorded_calls, mismatches)
+            for tool in agent.tools
+        ],
+    )
+
+    started = time.perf_counter()
+    result = await Runner.run(
+        replay_agent,
+        trace["input"],
+        context=AgentContext(character_file=trace["character_file"]),
+        run_config=RunConfig(tracing_disabled=True),
+    )
+    duration = time.perf_counter() - started
+
+    final_output = result.final_output
+    if hasattr(final_output, "model_dump"):
+        final_output = final_output.model_dump()
+    mismatches.extend(
+        f"{call['tool']}: recorded call not replayed"
+        for call in recorded_calls.values()
+    )
+    return {
+        "final_output": final_output,
+        "matches": final_output == trace["final_output"] and not mismatches,
+        "mismatches": mismatches,
+        "recorded_duration": trace["duration"],
+        "replay_duration": duration,
+    }
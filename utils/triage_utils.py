@@ -0,0 +1,160 @@
+import re
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable
+
+
+# Phrases that mark a tweet as spam outright
+DEFAULT_BLOCK_KEYWORDS = [
+    "follow back",
+    "follow for follow",
+    "giveaway",
+    "airdrop",
+    "crypto",
+    "nft",
+    "dm me",
+    "promo code",
+    "click here",
+    "onlyfans",
+]
+
+URL_PATTERN = re.compile(r"https?://\S+")
+MENTION_PATTERN = re.compile(r"@\w+")
+HASHTAG_PATTERN = re.compile(r"#\w+")
+
+
+@dataclass
+class TriageDecision:
+    """The triage outcome for a single tweet"""
+
+    tweet_id: str
+    accepted: bool
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+
+class TriagePipeline:
+    """
+    Cheap local filter that runs before a tweet is handed to the Twitter agent.
+
+    Tweets are rejected by keyword rules, by duplicate text (hash of the normalized
+    text) and by a small linear score over simple features. Only tweets scoring at
+    least `threshold` are worth a full agent run. Tweets addressed to the account
+    (mentions and replies to it) skip the keyword rules and the score, and are only
+    deduplicated per author.
+    """
+
+    def __init__(
+        self,
+        block_keywords: Optional[List[str]] = None,
+        boost_keywords: Optional[List[str]] = None,
+        threshold: float = 0.0,
+        own_user_id: Optional[str] = None,
+        dedup_capacity: int = 10000,
+    ):
+        block_keywords = (
+            DEFAULT_BLOCK_KEYWORDS if block_keywords is None else block_keywords
+        )
+        # One alternation matched on word boundaries, so "nft" doesn't match "unfit"
+        alternation = "|".join(re.escape(keyword.lower()) for keyword in block_keywords)
+        self.block_pattern = (
+            re.compile(rf"\b(?:{alternation})\b") if block_keywords else None
+        )
+        self.boost_keywords = [keyword.lower() for keyword in boost_keywords or []]
+        self.threshold = threshold
+        self.own_user_id = own_user_id
+        self.dedup_capacity = dedup_capacity
+        self._seen_hashes: "OrderedDict[str, None]" = OrderedDict()
+
+    def _normalize(self, text: str) -> str:
+        text = URL_PATTERN.sub("", text)
+        text = MENTION_PATTERN.sub("", text)
+        return " ".join(text.lower().split())
+
+    def _is_duplicate(self, text: str, author_id: Optional[str] = None) -> bool:
+        """Whether the text was seen before, from anyone or only from `author_id`"""
+        key = self._normalize(text)
+        if author_id is not None:
+            key = f"{author_id}:{key}"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        if digest in self._seen_hashes:
+            self._seen_hashes.move_to_end(digest)
+            return True
+        self._seen_hashes[digest] = None
+        if len(self._seen_hashes) > self.dedup_capacity:
+            self._seen_hashes.popitem(last=False)
+        return False
+
+    def score(self, text: str) -> float:
+        """Linear relevance score; positive means worth the agent's attention"""
+        lowered = text.lower()
+        words = self._normalize(text).split()
+        letters = [char for char in text if char.isalpha()]
+
+        score = 0.0
+        if "?" in text:
+            score += 1.0
+        score += 0.5 * sum(1 for keyword in self.boost_keywords if keyword in lowered)
+        score -= 0.75 * max(0, len(URL_PATTERN.findall(text)) - 1)
+        score -= 0.5 * max(0, len(HASHTAG_PATTERN.findall(text)) - 3)
+        score -= 0.5 * max(0, len(MENTION_PATTERN.findall(text)) - 3)
+        if len(words) < 3:
+            score -= 0.5
+        if len(letters) >= 10:
+            uppercase_ratio = sum(char.isupper() for char in letters) / len(letters)
+            if uppercase_ratio > 0.7:
+                score -= 1.0
+        return score
+
+    def evaluate(self, tweet: Dict[str, Any], direct: bool = False) -> TriageDecision:
+        """Decide whether a formatted tweet should reach the agent.
+
+        Args:
+            tweet (Dict[str, Any]): The formatted tweet.
+            direct (bool): Whether the tweet is addressed to the account (e.g. it
+                came from its mentions). Such tweets skip the spam keywords and the
+                relevance score, and only count as duplicates of the same author's
+                earlier tweets.
+        """
+        text = tweet.get("text", "")
+        decision = TriageDecision(tweet_id=str(tweet["id"]), accepted=False, score=0.0)
+
+        if self.own_user_id and str(tweet.get("author_id")) == str(self.own_user_id):
+            decision.reasons.append("own tweet")
+            return decision
+        references = tweet.get("referenced_tweets", [])
+        if any(ref.get("type") == "retweeted" for ref in references):
+            decision.reasons.append("retweet")
+            return decision
+
+        if self.own_user_id and str(tweet.get("in_reply_to_user_id")) == str(
+            self.own_user_id
+        ):
+            direct = True
+
+        # Customers write "dm me" too, and many of them write "thanks!"
+        if not direct:
+            blocked = (
+                self.block_pattern.search(text.lower()) if self.block_pattern else None
+            )
+            if blocked:
+                decision.reasons.append(f"blocked keyword: {blocked.group(0)}")
+                return decision
+        author_id = str(tweet.get("author_id")) if direct else None
+        if self._is_duplicate(text, author_id):
+            decision.reasons.append("duplicate text")
+            return decision
+
+        decision.score = self.score(text)
+        # Short genuine mentions score low but still deserve a look
+        decision.accepted = direct or decision.score >= self.threshold
+        if not decision.accepted:
+            decision.reasons.append(f"low score: {decision.score:.2f}")
+        return decision
+
+    def filter(
+        self, tweets: Iterable[Dict[str, Any]], direct: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Return only the tweets that pass triage, in their original order"""
+        return [tweet for tweet in tweets if self.evaluate(tweet, direct).accepted]
@@ -0,0 +1,258 @@
+import re
+import time
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Optional, List
+
+from utils.common_utils import (
+    get_data_path,
+    read_json_file,
+    write_json_file,
+    file_lock,
+)
+
+
+MAX_TWEET_LENGTH = 280
+# Every URL is wrapped by t.co and counts as this many characters regardless of its length
+URL_LENGTH = 23
+# Local history kept for duplicate detection
+POST_HISTORY_SIZE = 200
+POST_HISTORY_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Code point ranges that count as a single character (twitter-text v3 config);
+# everything else (CJK, most emoji, ...) counts as two
+_SINGLE_WEIGHT_RANGES = [
+    (0x0000, 0x10FF),
+    (0x2000, 0x200D),
+    (0x2010, 0x201F),
+    (0x2032, 0x2037),
+]
+
+# Trailing punctuation ("see https://x.com/a.") isn't part of the URL and is
+# counted separately, as in twitter-text
+URL_PATTERN = re.compile(
+    r"(?:https?://|www\.)[^\s]*[^\s.,!?)]"
+    r"|\b[a-z0-9][a-z0-9-]*(?:\.[a-z0-9-]+)*"
+    r"\.(?:com|org|net|io|co|ly|app|dev|ai|me|info|us|uk|ca|de)\b"
+    r"(?:/(?:[^\s]*[^\s.,!?)])?)?",
+    re.IGNORECASE,
+)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?\u2026])\s+|(?<=[\u3002\uFF01\uFF1F])\s*")
+# Emoji sequences (flags, keycaps, modifiers and ZWJ joins) count as two characters
+EMOJI_PATTERN = re.compile(
+    r"[\U0001F1E6-\U0001F1FF]{2}"
+    r"|[0-9#*]\uFE0F?\u20E3"
+    r"|(?:[\u2600-\u27BF\u2B00-\u2BFF\U0001F000-\U0001FAFF]\uFE0F?[\U0001F3FB-\U0001F3FF]?)"
+    r"(?:\u200D[\u2600-\u27BF\u2B00-\u2BFF\U0001F000-\U0001FAFF]\uFE0F?[\U0001F3FB-\U0001F3FF]?)*"
+)
+
+
+@dataclass
+class TweetValidation:
+    """Result of validating tweet text locally"""
+
+    valid: bool
+    weighted_length: int
+    max_length: int
+    errors: List[str] = field(default_factory=list)
+
+
+def _char_weight(char: str) -> int:
+    code_point = ord(char)
+    for start, end in _SINGLE_WEIGHT_RANGES:
+        if start <= code_point <= end:
+            return 1
+    return 2
+
+
+def weighted_length(text: str) -> int:
+    """Count characters the way Twitter does.
+
+    URLs count as 23 characters, emoji sequences as 2, code points outside the
+    Latin/punctuation ranges (e.g. CJK) as 2, and everything else as 1.
+    """
+    text = unicodedata.normalize("NFC", text)
+    length = 0
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        length += _plain_length(text[position : match.start()]) + URL_LENGTH
+        position = match.end()
+    return length + _plain_length(text[position:])
+
+
+def _plain_length(text: str) -> int:
+    length = 0
+    position = 0
+    for match in EMOJI_PATTERN.finditer(text):
+        length += sum(_char_weight(char) for char in text[position : match.start()])
+        length += 2
+        position = match.end()
+    return length + sum(_char_weight(char) for char in text[position:])
+
+
+def _text_hash(text: str) -> str:
+    normalized = " ".join(unicodedata.normalize("NFC", text).lower().split())
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+class PostHistory:
+    """Hashes of recently posted tweets, persisted to disk, for duplicate detection"""
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or get_data_path("post_history.json")
+        self.entries: List[dict] = read_json_file(self.file_path, [])
+
+    def _recent(self) -> List[dict]:
+        cutoff = time.time() - POST_HISTORY_MAX_AGE_SECONDS
+        return [entry for entry in self.entries if entry["posted_at"] >= cutoff]
+
+    def find_duplicate(self, text: str) -> Optional[str]:
+        """Return the ID of a recent post with the same text, if any"""
+        digest = _text_hash(text)
+        # Pick up posts recorded by other worker processes
+        self.entries = read_json_file(self.file_path, self.entries)
+        for entry in self._recent():
+            if entry["hash"] == digest:
+                return entry["tweet_id"]
+        return None
+
+    def record(self, text: str, tweet_id: str) -> None:
+        entry = {
+            "hash": _text_hash(text),
+            "tweet_id": str(tweet_id),
+            "posted_at": time.time(),
+        }
+        with file_lock(self.file_path):
+            self.entries = read_json_file(self.file_path, self.entries)
+            self.entries = self._recent()[-(POST_HISTORY_SIZE - 1) :] + [entry]
+            write_json_file(self.file_path, self.entries)
+
+    def remove(self, tweet_id: str) -> None:
+        """Forget a post (e.g. after it was deleted), so its text may be posted again"""
+        with file_lock(self.file_path):
+            self.entries = read_json_file(self.file_path, self.entries)
+            self.entries = [
+                entry for entry in self.entries if entry["tweet_id"] != str(tweet_id)
+            ]
+            write_json_file(self.file_path, self.entries)
+
+
+def validate_tweet(
+    text: str,
+    max_length: int = MAX_TWEET_LENGTH,
+    history: Optional[PostHistory] = None,
+) -> TweetValidation:
+    """Validate tweet text locally before it is sent to the API.
+
+    Args:
+        text (str): The tweet text.
+        max_length (int): Maximum weighted length (default: 280).
+        history (Optional[PostHistory]): If given, reject text identical to a recent post.
+
+    Returns:
+        TweetValidation: Whether the text is valid, its weighted length and any errors.
+    """
+    length = weighted_length(text)
+    errors = []
+    if not text.strip():
+        errors.append("Tweet is empty")
+    if length > max_length:
+        errors.append(
+            f"Tweet too long: {length} weighted characters (max {max_length}). "
+            f"URLs count as {URL_LENGTH}, emoji and CJK characters count as 2"
+        )
+    if history:
+        duplicate_id = history.find_duplicate(text)
+        if duplicate_id:
+            errors.append(f"Duplicate of recently posted tweet {duplicate_id}")
+    return TweetValidation(
+        valid=not errors, weighted_length=length, max_length=max_length, errors=errors
+    )
+
+
+def _fit_words(text: str, max_length: int) -> List[str]:
+    """Split text that doesn't fit into pieces on word boundaries (hard-splitting long words)"""
+    pieces: List[str] = []
+    current = ""
+    for word in text.split():
+        while weighted_length(word) > max_length:
+            cut = max_length
+            while weighted_length(word[:cut]) > max_length:
+                cut -= 1
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:cut])
+            word = word[cut:]
+        candidate = f"{current} {word}" if current else word
+        if weighted_length(candidate) <= max_length:
+            current = candidate
+        else:
+            pieces.append(current)
+            current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _pack_sentences(text: str, max_length: int) -> List[str]:
+    sentences: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text.strip()):
+        sentences.extend(
+            sentence
+            for sentence in SENTENCE_BOUNDARY.split(" ".join(paragraph.split()))
+            if sentence
+        )
+
+    segments: List[str] = []
+    current = ""
+    for sentence in sentences:
+        if weighted_length(sentence) > max_length:
+            if current:
+                segments.append(current)
+                current = ""
+            segments.extend(_fit_words(sentence, max_length))
+            continue
+        candidate = f"{current} {sentence}" if current else sentence
+        if weighted_length(candidate) <= max_length:
+            current = candidate
+        else:
+            segments.append(current)
+            current = sentence
+    if current:
+        segments.append(current)
+    return segments
+
+
+def split_into_thread(
+    text: str, max_length: int = MAX_TWEET_LENGTH, numbered: bool = True
+) -> List[str]:
+    """Split long text into tweets on sentence boundaries.
+
+    Each segment fits `max_length` by weighted length, including a " i/n" suffix
+    when `numbered` is set. Sentences that don't fit on their own are split on words.
+
+    Args:
+        text (str): The text to split.
+        max_length (int): Maximum weighted length per tweet (default: 280).
+        numbered (bool): Whether to append " i/n" to each tweet (default: True).
+
+    Returns:
+        List[str]: The thread segments in posting order.
+    """
+    if weighted_length(text) <= max_length:
+        return [text.strip()]
+    if not numbered:
+        return _pack_sentences(text, max_length)
+
+    # The suffix width depends on the segment count, so repeat until it is stable
+    digits = 1
+    while True:
+        suffix_length = len(f" {'9' * digits}/{'9' * digits}")
+        segments = _pack_sentences(text, max_length - suffix_length)
+        if len(str(len(segments))) <= digits:
+            break
+        digits = len(str(len(segments)))
+    total = len(segments)
+    return [f"{segment} {i}/{total}" for i, segment in enumerate(segments, start=1)]
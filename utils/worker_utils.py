@@ -0,0 +1,344 @@
+import os
+import json
+import time
+import queue
+import asyncio
+import multiprocessing
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, List
+
+from agents import Runner
+
+from ai_agents.twitter_agent import create_twitter_agent
+from agent_tools.twitter_tools import RateLimitTracker, _get_twitter_api
+from utils.agent_utils import AgentContext
+from utils.trace_utils import RunRecorder
+from utils.profiling_utils import flush_stats
+from utils.character_utils import get_character_registry
+
+
+# Agent runs are mostly waiting on the network, so each worker process overlaps a
+# few of them on its event loop
+WORKER_CONCURRENCY = 4
+
+# A job whose worker died is requeued (if it allows retries) until it has been
+# attempted this many times, then reported failed
+JOB_MAX_ATTEMPTS = 2
+
+# Seconds between worker health checks while waiting for results
+SUPERVISE_INTERVAL = 1.0
+
+# Give up instead of respawning forever when workers keep crashing (e.g. on startup)
+WORKER_MAX_RESTARTS = 10
+
+
+@dataclass
+class AgentJob:
+    """
+    A request for the Twitter agent, run with a given character.
+
+    A job whose worker dies is only run again if `retry` is set. The job may have
+    posted before the crash, and a rerun writes new text that the duplicate check
+    doesn't catch, so only enable it for requests that are safe to repeat.
+    """
+
+    job_id: str
+    request: str
+    character_file: str = "fresh_harvest.md"
+    retry: bool = False
+
+
+@dataclass
+class JobResult:
+    job_id: str
+    success: bool
+    worker: int
+    duration: float
+    action_type: Optional[str] = None
+    reasoning: Optional[str] = None
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def load_jobs(file_path: str) -> List[AgentJob]:
+    """
+    Read jobs from a JSON lines file.
+
+    Each line holds a `request` and optionally a `character` file, a `job_id`
+    (defaults to the line number) and `retry` (rerun the job if its worker dies).
+
+    Args:
+        file_path (str): The path to the jobs file.
+
+    Returns:
+        List[AgentJob]: The jobs, in file order.
+    """
+    jobs = []
+    with open(file_path, "r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            jobs.append(
+                AgentJob(
+                    job_id=str(entry.get("job_id", line_number)),
+                    request=entry["request"],
+                    character_file=entry.get("character", "fresh_harvest.md"),
+                    retry=bool(entry.get("retry", False)),
+                )
+            )
+    return jobs
+
+
+async def _run_job(agent, job: AgentJob, worker_id: int) -> JobResult:
+    started = time.perf_counter()
+    recorder = RunRecorder(job.request, job.character_file, agent.name)
+    try:
+        result = await Runner.run(
+            agent,
+            job.request,
+            context=AgentContext(character_file=job.character_file),
+            hooks=recorder,
+        )
+        recorder.save(result)
+        return JobResult(
+            job_id=job.job_id,
+            success=True,
+            worker=worker_id,
+            duration=time.perf_counter() - started,
+            action_type=result.final_output.action_type,
+            reasoning=result.final_output.reasoning,
+            run_id=recorder.run_id,
+        )
+    except Exception as e:
+        return JobResult(
+            job_id=job.job_id,
+            success=False,
+            worker=worker_id,
+            duration=time.perf_counter() - started,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+async def _worker_loop(
+    worker_id: int, jobs, events, rate_limit_store, concurrency: int
+) -> None:
+    twitter_api = _get_twitter_api()
+    if twitter_api:
+        # Every worker uses the same credentials, so they share one rate-limit view
+        twitter_api.rate_limits = RateLimitTracker(rate_limit_store)
+    agent = create_twitter_agent()
+    # Keep every character resident so jobs switch characters without any I/O
+    get_character_registry()
+
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def _handle(job: AgentJob) -> None:
+        try:
+            events.put(("result", asdict(await _run_job(agent, job, worker_id))))
+        finally:
+            slots.release()
+
+    while True:
+        await slots.acquire()
+        job = await asyncio.to_thread(jobs.get)
+        if job is None:
+            break
+        events.put(("claimed", job.job_id, worker_id))
+        task = asyncio.create_task(_handle(job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+def _worker_main(
+    worker_id: int, jobs, events, rate_limit_store, concurrency: int
+) -> None:
+    """Entry point of a worker process: one event loop running jobs until a sentinel"""
+    try:
+        asyncio.run(
+            _worker_loop(worker_id, jobs, events, rate_limit_store, concurrency)
+        )
+    finally:
+        flush_stats()
+
+
+class WorkerPool:
+    """
+    Supervisor that shards agent jobs across worker processes.
+
+    Each worker runs its own event loop with up to `concurrency` agent runs in
+    flight, so model output validation and event handling use every core. Workers
+    share on-disk state through the data directory (file writes are locked) and
+    the rate-limit state of every v2 request through a coordinator process.
+    Workers that die are replaced and their claimed jobs failed, or requeued if
+    they allow retries.
+
+    All workers use the Twitter credentials from the environment; run one pool per
+    account, each with its own `TWITTER_AGENT_DATA_DIR`.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        concurrency: int = WORKER_CONCURRENCY,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        # Spawned workers don't inherit the parent's threads or event loop
+        self._mp = multiprocessing.get_context("spawn")
+        self._manager = None
+        self._rate_limits = None
+        self._jobs = None
+        self._events = None
+        self._workers: Dict[int, Any] = {}
+        self._next_worker_id = 0
+        self._restarts = 0
+
+    def _spawn_worker(self) -> None:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self._jobs,
+                self._events,
+                self._rate_limits,
+                self.concurrency,
+            ),
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = process
+
+    def start(self) -> None:
+        self._manager = self._mp.Manager()
+        self._rate_limits = self._manager.dict()
+        self._jobs = self._mp.Queue()
+        self._events = self._mp.Queue()
+        for _ in range(self.processes):
+            self._spawn_worker()
+
+    def _requeue_lost_job(
+        self,
+        job_id: str,
+        worker_id: int,
+        pending: Dict[str, AgentJob],
+        attempts: Dict[str, int],
+    ) -> Optional[JobResult]:
+        """Requeue a job whose worker died if it allows retries, or fail it"""
+        if job_id not in pending:
+            return None
+        attempts[job_id] += 1
+        if pending[job_id].retry and attempts[job_id] < JOB_MAX_ATTEMPTS:
+            self._jobs.put(pending[job_id])
+            return None
+        return JobResult(
+            job_id=job_id,
+            success=False,
+            worker=worker_id,
+            duration=0.0,
+            error=f"Worker {worker_id} exited while running the job",
+        )
+
+    def _replace_dead_workers(
+        self,
+        claimed: Dict[str, int],
+        pending: Dict[str, AgentJob],
+        attempts: Dict[str, int],
+    ) -> List[JobResult]:
+        """Respawn workers that died, requeueing or failing the jobs they held"""
+        failed = []
+        for worker_id, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            del self._workers[worker_id]
+            print(f"Warning: worker {worker_id} exited with code {process.exitcode}")
+            self._restarts += 1
+            if self._restarts > WORKER_MAX_RESTARTS:
+                raise RuntimeError(
+                    f"Workers exited {self._restarts} times, giving up"
+                )
+            lost = [job_id for job_id, owner in claimed.items() if owner == worker_id]
+            for job_id in lost:
+                del claimed[job_id]
+                result = self._requeue_lost_job(job_id, worker_id, pending, attempts)
+                if result:
+                    failed.append(result)
+            self._spawn_worker()
+        return failed
+
+    def _next_events(self) -> List[tuple]:
+        """Wait up to `SUPERVISE_INTERVAL` for events, then take all queued ones"""
+        try:
+            events = [self._events.get(timeout=SUPERVISE_INTERVAL)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def run(self, jobs: List[AgentJob]) -> List[JobResult]:
+        """
+        Run every job and wait for all of them.
+
+        Args:
+            jobs (List[AgentJob]): The jobs to run. Job IDs must be unique.
+
+        Returns:
+            List[JobResult]: One result per job, in completion order.
+        """
+        pending = {job.job_id: job for job in jobs}
+        attempts = {job.job_id: 0 for job in jobs}
+        claimed: Dict[str, int] = {}
+        results: List[JobResult] = []
+
+        for job in jobs:
+            self._jobs.put(job)
+
+        while pending:
+            # Handle every queued event before looking for dead workers, so claims
+            # sent just before a worker died are attributed to it
+            for event in self._next_events():
+                if event[0] == "claimed":
+                    job_id, worker_id = event[1], event[2]
+                    if worker_id in self._workers:
+                        claimed[job_id] = worker_id
+                        continue
+                    # Claimed by a worker that was already replaced: nobody runs it
+                    result = self._requeue_lost_job(
+                        job_id, worker_id, pending, attempts
+                    )
+                else:
+                    result = JobResult(**event[1])
+                    claimed.pop(result.job_id, None)
+                if result and pending.pop(result.job_id, None):
+                    results.append(result)
+
+            for result in self._replace_dead_workers(claimed, pending, attempts):
+                pending.pop(result.job_id, None)
+                results.append(result)
+        return results
+
+    def close(self) -> None:
+        """Stop the workers once their current jobs finish"""
+        for _ in self._workers:
+            self._jobs.put(None)
+        for process in self._workers.values():
+            process.join()
+        self._workers.clear()
+        if self._manager:
+            self._manager.shutdown()
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()